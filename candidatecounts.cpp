@@ -0,0 +1,154 @@
+/***************************************************************************************
+ *
+ * This program solves various 3D puzzles.
+ * Copyright (C) 2016  Dominik Vilsmeier
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ *
+ ***************************************************************************************/
+
+#include "candidatecounts.h"
+#include <algorithm>
+
+using namespace std;
+
+CandidateCounts::CandidateCounts(size_t numberOfSites, const int* data, size_t length)
+		: covering(numberOfSites), counts(numberOfSites, 0), free(numberOfSites, true), numberOfFreeSites(numberOfSites),
+		  numberOfWords((numberOfSites + 63) / 64), low(0)
+{
+	size_t i = 0;
+	while(i < length) {
+		size_t placement = placementPieces.size();
+		placementPieces.push_back(data[i]);
+		placementConfigs.push_back(data[i+1]);
+		placementAnchors.push_back(data[i+2]);
+		size_t size = data[i+3];
+		placementSites.push_back(vector<size_t>(data + i + 4, data + i + 4 + size));
+		for(size_t j=0; j<size; ++j) {
+			covering[data[i+4+j]].push_back(placement);
+		}
+		i += 4 + size;
+	}
+
+	vector<vector<size_t> > byPiece;  // placements of each piece;
+	for(size_t p=0; p<placementPieces.size(); ++p) {
+		if(placementPieces[p] >= byPiece.size()) byPiece.resize(placementPieces[p] + 1);
+		byPiece[placementPieces[p]].push_back(p);
+	}
+	for(size_t p=0; p<placementSites.size(); ++p) {  // placements of the same piece and those covering one of the sites;
+		vector<size_t> others(byPiece[placementPieces[p]]);
+		for(size_t j=0; j<placementSites[p].size(); ++j) {
+			others.insert(others.end(), covering[placementSites[p][j]].begin(), covering[placementSites[p][j]].end());
+		}
+		sort(others.begin(), others.end());
+		others.erase(unique(others.begin(), others.end()), others.end());
+		conflicts.push_back(others);
+	}
+	blocked.resize(placementSites.size(), 0);
+
+	size_t maximum = 0;
+	for(size_t site=0; site<numberOfSites; ++site) {
+		counts[site] = covering[site].size();
+		maximum = max(maximum, counts[site]);
+	}
+	buckets.resize((maximum+1) * numberOfWords, 0);
+	for(size_t site=0; site<numberOfSites; ++site) {
+		addToBucket(site);
+	}
+}
+
+void CandidateCounts::place(size_t placement) {
+
+	for(size_t j=0; j<placementSites[placement].size(); ++j) {
+		size_t site = placementSites[placement][j];
+		removeFromBucket(site);
+		free[site] = 0;
+	}
+	numberOfFreeSites -= placementSites[placement].size();
+
+	blockedStart.push_back(blockedStack.size());
+	for(size_t i=0; i<conflicts[placement].size(); ++i) {
+		size_t other = conflicts[placement][i];
+		if(blocked[other]) continue;  // blocked by an earlier placement already;
+		blocked[other] = 1;
+		blockedStack.push_back(other);
+		for(size_t j=0; j<placementSites[other].size(); ++j) {
+			size_t site = placementSites[other][j];
+			if(free[site]) {
+				removeFromBucket(site);
+				counts[site] -= 1;
+				addToBucket(site);
+				low = min(low, counts[site]);
+			} else {
+				counts[site] -= 1;
+			}
+		}
+	}
+}
+
+void CandidateCounts::remove(size_t placement) {
+
+	// unblock only the placements that this one blocked, not its whole conflict list;
+	for(size_t i=blockedStart.back(); i<blockedStack.size(); ++i) {
+		size_t other = blockedStack[i];
+		blocked[other] = 0;
+		for(size_t j=0; j<placementSites[other].size(); ++j) {
+			size_t site = placementSites[other][j];
+			if(free[site]) {
+				removeFromBucket(site);
+				counts[site] += 1;
+				addToBucket(site);
+			} else {
+				counts[site] += 1;
+			}
+		}
+	}
+	blockedStack.resize(blockedStart.back());
+	blockedStart.pop_back();
+
+	for(size_t j=0; j<placementSites[placement].size(); ++j) {
+		size_t site = placementSites[placement][j];
+		free[site] = 1;
+		addToBucket(site);
+		low = min(low, counts[site]);
+	}
+	numberOfFreeSites += placementSites[placement].size();
+}
+
+int CandidateCounts::argmin() {
+
+	if(numberOfFreeSites == 0) return -1;  // all sites occupied;
+	for(;; ++low) {
+		for(size_t w=0; w<numberOfWords; ++w) {
+			if(buckets[low*numberOfWords + w] != 0) return 64*w + __builtin_ctzll(buckets[low*numberOfWords + w]);  // lowest set bit;
+		}
+	}
+}
+
+void CandidateCounts::fitting(size_t site, vector<size_t>& placements) {
+
+	for(size_t i=0; i<covering[site].size(); ++i) {
+		if(blocked[covering[site][i]] == 0) placements.push_back(covering[site][i]);
+	}
+}
+
+void CandidateCounts::addToBucket(size_t site) {
+
+	buckets[counts[site]*numberOfWords + site/64] |= 1ULL << (site % 64);
+}
+
+void CandidateCounts::removeFromBucket(size_t site) {
+
+	buckets[counts[site]*numberOfWords + site/64] &= ~(1ULL << (site % 64));
+}
\ No newline at end of file
@@ -0,0 +1,68 @@
+/***************************************************************************************
+ *
+ * This program solves various 3D puzzles.
+ * Copyright (C) 2016  Dominik Vilsmeier
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ *
+ ***************************************************************************************/
+
+#ifndef INC_3D_PUZZLE_SOLVER_CANDIDATE_COUNTS_H
+#define INC_3D_PUZZLE_SOLVER_CANDIDATE_COUNTS_H
+
+#include <cstddef>
+#include <vector>
+
+using namespace std;
+
+/*
+ * Number of fitting placements per free site, kept up to date while placements are made and taken back (in reverse order).
+ * A placement is a configuration of a piece whose seed is put on a specific site; it fits as long as no placement that was made
+ * conflicts with it (covers one of its sites or uses the same piece). Free sites are kept in buckets by count, each a bit set
+ * of the sites, so the most constrained free site (the first one in scan order among those with the fewest fitting placements,
+ * like puzzle3d.counts in the Python package) can be found in constant time (amortised, for a fixed number of sites).
+ *
+ * The placements are generated by the Python package (see create_placements.h), sites are numbered in the order of
+ * Lattice::toStringLightweight.
+ */
+class CandidateCounts {
+public:
+	vector<size_t> placementPieces;  // piece index of each placement;
+	vector<size_t> placementConfigs;  // config index (within the piece) of each placement;
+	vector<size_t> placementAnchors;  // index of the site on which the seed is placed;
+	vector<vector<size_t> > placementSites;  // covered sites of each placement;
+	vector<vector<size_t> > covering;  // placements which cover each site;
+	vector<vector<size_t> > conflicts;  // placements which can't be combined with each placement (including itself);
+	vector<char> blocked;  // placements that conflict with a made placement (char rather than bool: faster to test);
+	vector<size_t> blockedStack;  // placements in the order in which they were blocked;
+	vector<size_t> blockedStart;  // per made placement: size of blockedStack before it was made;
+	vector<size_t> counts;  // number of fitting placements which cover each site;
+	vector<char> free;
+	size_t numberOfFreeSites;
+	size_t numberOfWords;  // 64 bit words per bucket;
+	vector<unsigned long long> buckets;  // free sites with each count, one bit per site: words count*numberOfWords to (count+1)*numberOfWords-1;
+	size_t low;  // no free site has a smaller count;
+
+	// data holds for each placement: piece index, config index, anchor site, number of sites, the sites;
+	CandidateCounts(size_t numberOfSites, const int* data, size_t length);
+
+	void place(size_t placement);
+	void remove(size_t placement);
+	int argmin();
+	void fitting(size_t site, vector<size_t>& placements);
+	void addToBucket(size_t site);
+	void removeFromBucket(size_t site);
+};
+
+#endif // INC_3D_PUZZLE_SOLVER_CANDIDATE_COUNTS_H
\ No newline at end of file
@@ -0,0 +1,90 @@
+/***************************************************************************************
+ *
+ * This program solves various 3D puzzles.
+ * Copyright (C) 2016  Dominik Vilsmeier
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ *
+ ***************************************************************************************/
+
+#include "checkpoint.h"
+#include "piece.h"
+#include <cstdio>
+#include <fstream>
+
+using namespace std;
+
+Checkpoint::Checkpoint(string path, double interval)
+		: path(path), interval(interval), resuming(false), counter(0)
+{
+	time(&lastWrite);
+}
+
+bool Checkpoint::load(size_t* numberOfSolutions, size_t* outputSize) {
+
+	ifstream file(path.c_str());
+	if(!file) file.open((path + ".tmp").c_str());  // interrupted while replacing the checkpoint;
+	size_t depth;
+	if(!(file >> *numberOfSolutions >> *outputSize >> depth)) return false;  // no checkpoint yet;
+
+	resumeIndices.resize(depth);
+	resumeMarkers.resize(depth);
+	for(size_t i=0; i<depth; ++i) {
+		if(!(file >> resumeIndices[i] >> resumeMarkers[i])) return false;
+	}
+	resuming = true;
+	return true;
+}
+
+void Checkpoint::push(size_t pieceIndex, Piece* piece) {
+	pieceIndices.push_back(pieceIndex);
+	placedPieces.push_back(piece);
+}
+
+void Checkpoint::pop() {
+	pieceIndices.pop_back();
+	placedPieces.pop_back();
+}
+
+bool Checkpoint::due() {
+
+	if((++counter & 0xFFFF) != 0) return false;  // don't ask the clock on every call;
+
+	time_t now;
+	time(&now);
+	return difftime(now, lastWrite) >= interval;
+}
+
+void Checkpoint::write(size_t numberOfSolutions, size_t outputSize) {
+
+	string temporaryPath = path + ".tmp";
+	{
+		ofstream file(temporaryPath.c_str());
+		file << numberOfSolutions << " " << outputSize << " " << pieceIndices.size();
+		for(size_t i=0; i<pieceIndices.size(); ++i) {
+			file << " " << pieceIndices[i] << " " << placedPieces[i]->currentConfigMarker;
+		}
+		file << endl;
+	}
+	if(rename(temporaryPath.c_str(), path.c_str()) != 0) {  // rename doesn't replace existing files on all platforms;
+		std::remove(path.c_str());
+		rename(temporaryPath.c_str(), path.c_str());
+	}
+
+	time(&lastWrite);
+}
+
+void Checkpoint::remove() {
+	std::remove(path.c_str());
+}
\ No newline at end of file
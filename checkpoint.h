@@ -0,0 +1,61 @@
+/***************************************************************************************
+ *
+ * This program solves various 3D puzzles.
+ * Copyright (C) 2016  Dominik Vilsmeier
+ *
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ *
+ ***************************************************************************************/
+
+#ifndef INC_3D_PUZZLE_SOLVER_CHECKPOINT_H
+#define INC_3D_PUZZLE_SOLVER_CHECKPOINT_H
+
+#include <ctime>
+#include <string>
+#include <vector>
+
+class Piece;
+
+using namespace std;
+
+/*
+ * Position of the search, i.e. the index of the piece and its Piece::currentConfigMarker for every placement made so far.
+ * The position is written to a file periodically, along with the size of the output file at that moment; a later run that uses
+ * the same file cuts the output back to that size and continues right after the position.
+ *
+ * File format (one line): <number of solutions found> <output size> <depth> <piece index> <config marker> <piece index> <config marker> ...
+ */
+class Checkpoint {
+public:
+	string path;  // file to which the position is written;
+	double interval;  // minimum number of seconds between two writes;
+	vector<size_t> pieceIndices;  // index of the piece placed at each depth;
+	vector<Piece*> placedPieces;  // the piece placed at each depth;
+	vector<size_t> resumeIndices;  // position to resume from (piece index and config marker per depth);
+	vector<size_t> resumeMarkers;
+	bool resuming;  // true until the search reaches the resumed position;
+	size_t counter;  // number of calls to Checkpoint::due();
+	time_t lastWrite;
+
+	Checkpoint(string path, double interval);
+
+	bool load(size_t* numberOfSolutions, size_t* outputSize);
+	void push(size_t pieceIndex, Piece* piece);
+	void pop();
+	bool due();
+	void write(size_t numberOfSolutions, size_t outputSize);
+	void remove();
+};
+
+#endif // INC_3D_PUZZLE_SOLVER_CHECKPOINT_H
\ No newline at end of file
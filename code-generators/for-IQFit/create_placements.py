@@ -0,0 +1,38 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Writes the body of the `createCandidateCounts` function for this puzzle (see puzzle3d.puzzles.iqfit) to create_placements_code.txt.
+The placements are only needed by the solver's --mrv option.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))  # make the puzzle3d package importable
+
+from puzzle3d import CodeEmitter, write_placements_code
+from puzzle3d.placements import PlacementTable
+from puzzle3d.puzzles import iqfit
+
+
+with open('create_placements_code.txt', 'w') as fp:
+	write_placements_code(PlacementTable.build(iqfit.lattice, iqfit.pieces), CodeEmitter(fp))
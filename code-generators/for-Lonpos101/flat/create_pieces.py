@@ -20,264 +20,17 @@
 
 
 """
-The direction to the next junction is indicated by (x,y,z).
-A branch (sequence of directions) is indicated by [ (), ... ].
-A fork (multiple branches going off the current junction) is indicated by enclosing all branches in additional square brackets, i.e. [[ (), ... ], [ (), ... ], ...].
-
-An example configuration:
-[ (1,0,0), [[ (1,0,0) ], [ (0,1,0) ]] ]
-where the outer square brackets indicate the main branch and the inner (2nd) square brackets indicate a off-branching, enclosing the new branches (3rd level of square brackets).
-The above configuration means:
-1) go towards (1,0,0)
-	1.1) go towards (1,0,0)
-	1.2) go towards (0,1,0)
-
-Another example:
-[ (1,0,0), [[ (1,0,0), [[ (0,0,1), (0,0,1) ], [ (0,1,0) ]] ], [ (0,1,0) ], [ (0,0,1) ]] ]
-which means:
-1) go towards (1,0,0)
-	1.1) go towards (1,0,0)
-		1.1.1) go towards (0,0,1)
-			1.1.1.1) go towards (0,0,1)
-		1.1.2) go towards (0,1,0)
-	1.2) go towards (0,1,0)
-	1.3) go towards (0,0,1)
+Writes the body of the `createPieces` function for this puzzle (see puzzle3d.puzzles.lonpos_flat) to create_pieces_code.txt.
 """
 
-def rotate_clockwise_by_90_degrees(links):
-	"""
-	Rotates vector by pi/2 around the z-axis: x -> -y, y -> x, z -> z.
-	"""
-	new_links = []
-	for elem in links:
-		if isinstance(elem, list):  # more than one branch
-			branch_list = []
-			for branch in elem:
-				branch_list.append(rotate_clockwise_by_90_degrees(branch))
-			new_links.append(branch_list)
-		else:
-			new_links.append((-elem[1], elem[0], elem[2]))  # rotated vector
-	return new_links
-
-def mirror_on_y_axis(links):
-	"""
-	Mirrors vector on the y-axis: x -> -x, y -> y, z -> z.
-	"""
-	new_links = []
-	for elem in links:
-		if isinstance(elem, list):  # more than one branch
-			branch_list = []
-			for branch in elem:
-				branch_list.append(mirror_on_y_axis(branch))
-			new_links.append(branch_list)
-		else:
-			new_links.append((-elem[0], elem[1], elem[2]))  # mirrored vector
-	return new_links
-
-
-output = ""  # stores the generated code
-n_junctions=0  # stores the number of junction that were already generated for a specific piece
-def follow_branch(links, prev_junc_id):
-	global output
-	global n_junctions
-	
-	elem = links.pop(0)
-	if isinstance(elem, list):  # more than one branch
-		for branch in elem:
-			follow_branch(branch, prev_junc_id)
-	else:
-		output = output + "junc%d = new Junction;\n" % n_junctions  # create new junction
-		output = output + "junc%d->branches.push_back(junc%d);\n" % (prev_junc_id, n_junctions)  # link junction to previous one
-		output = output + "junc%d->directions.push_back(new Vector3d(%d,%d,%d));\n" % (prev_junc_id, elem[0], elem[1], elem[2])  # store corresponding direction
-		n_junctions =  n_junctions + 1
-
-		if len(links) > 0:
-			follow_branch(links, n_junctions-1)
-
-
-def start(links, start_comments=[], end_comments=[]):
-	global output
-	global n_junctions
-
-	output = output + '\n'.join('// '+comment for comment in start_comments) + '\n'  # write start comments, if any
-	output = output + "junc0 = new Junction;\n"  # create seed junction
-	n_junctions = 1
-	follow_branch(links, 0)  # create all other junctions
-	output = output + "config = new Configuration;\n"  # create corresponding configuration
-	output = output + "config->seed = junc0;\n"  # set seed junction
-	output = output + "piece->configs.push_back(config);\n"  # add configuration to piece
-	output = output + '\n'.join('// '+comment for comment in end_comments)  # write end comments, if any
-	output = output + '\n'
-
-
-class Piece:
-	def __init__(self, configs, identifier):
-		self.configs = configs
-		self.identifier = identifier
-
-	def create_all_configs(self):
-		global output
-
-		output = output + '// ---------- %s ----------\n' % self.identifier  # write identifier
-		output = output + "piece = new Piece('%s');\n" % self.identifier[-2]  # create piece
-		output = output + 'pieces->push_back(piece);\n'  # add piece to list of pieces
-		for config in self.configs:  # create all configurations
-			start(config.links)
-		output = output + '// ---------- END %s END ----------\n' % self.identifier  # indicate this piece is complete
-		output = output + '\n\n'
-
-class Config:
-	def __init__(self, links):
-		self.links = links
-
-	def create_all_rotated_and_mirrored_flat(self):
-		"""
-		Create the configuration + all rotated configurations (pi/2, pi, 3pi/2) + all rotations (0, pi/2, pi, 3pi/2) of the mirrored (y-axis) configuration.
-		"""
-		configs = []
-		links = self.links
-		for i in range(4):
-			configs.append(Config(links))
-			links = rotate_clockwise_by_90_degrees(links)
-		links = mirror_on_y_axis(links)
-		for i in range(4):
-			configs.append(Config(links))
-			links = rotate_clockwise_by_90_degrees(links)
-		return configs
-
-	def create_all_rotated_flat(self):
-		"""
-		Create the configuration + all rotated configurations (pi/2, pi, 3pi/2).
-		"""
-		configs = []
-		links = self.links
-		for i in range(4):
-			configs.append(Config(links))
-			links = rotate_clockwise_by_90_degrees(links)
-		return configs
-
-	def __str__(self):
-		return str(self.links)
-
-
-pieces = []
-
-up = (0,-1,0)
-right = (1,0,0)
-down = (0,1,0)
-left = (-1,0,0)
-
-
-orange = Piece(
-	Config( [ down, right, right ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ [[ down, down ], [ right ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ down, down, right ] ).create_all_rotated_and_mirrored_flat(),
-	'orange (A)'
-)
-pieces.append(orange)
-
-red = Piece(
-	Config( [ down, down, left, up ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ down, right, up, right ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ [[ down, right, right ], [ right ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ right, down, left, left ] ).create_all_rotated_and_mirrored_flat(),
-	'red (B)'
-)
-pieces.append(red)
-
-blue = Piece(
-	Config( [ right, up, up, up ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ [[ up, up, up ], [ left ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ down, down, down, left ] ).create_all_rotated_and_mirrored_flat(),
-	'blue (C)'
-)
-pieces.append(blue)
-
-pinkish = Piece(
-	Config( [ down, down, [[ left ], [ down ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ right, [[ up, up ], [ down ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ up, [[ left ], [ up, up ]] ] ).create_all_rotated_and_mirrored_flat(),
-	'pinkish (D)'
-)
-pieces.append(pinkish)
-
-green = Piece(
-	Config( [ down, down, left, down ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ [[ left, down ], [ up, up ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ [[ down ], [ right, up, up ]] ] ).create_all_rotated_and_mirrored_flat() +\
-	Config( [ up, right, up, up ] ).create_all_rotated_and_mirrored_flat(),
-	'green (E)'
-)
-pieces.append(green)
-
-white = Piece(
-	Config( [ down, left ] ).create_all_rotated_flat() +\
-	Config( [ [[ left ], [ up ]] ] ).create_all_rotated_flat() +\
-	Config( [ right, up ] ).create_all_rotated_flat(),
-	'white (F)'
-)
-pieces.append(white)
-
-lightblue = Piece(
-	Config( [ down, down, left, left ] ).create_all_rotated_flat() +\
-	Config( [ [[ left, left ], [ up, up ]] ] ).create_all_rotated_flat() +\
-	Config( [ right, right, up, up ] ).create_all_rotated_flat(),
-	'lightblue (G)'
-)
-pieces.append(lightblue)
-
-rose = Piece(
-	Config( [ down, left, down, left ] ).create_all_rotated_flat() +\
-	Config( [ [[ left, down, left ], [ up ]] ] ).create_all_rotated_flat() +\
-	Config( [ [[ down, left ], [ right, up ]] ] ).create_all_rotated_flat() +\
-	Config( [ [[ left ], [ up, right, up ]] ] ).create_all_rotated_flat() +\
-	Config( [ right, up, right, up ] ).create_all_rotated_flat(),
-	'rose (H)'
-)
-pieces.append(rose)
-
-yellow = Piece(
-	Config( [ down, right, right, up ] ).create_all_rotated_flat() +\
-	Config( [ [[ up ], [ right, right, up ]] ] ).create_all_rotated_flat() +\
-	Config( [ [[ left, up ], [ right, up ]] ] ).create_all_rotated_flat() +\
-	Config( [ [[ left, left, up ], [ up ]] ] ).create_all_rotated_flat() +\
-	Config( [ down, left, left, up ] ).create_all_rotated_flat(),
-	'yellow (I)'
-)
-pieces.append(yellow)
-
-purple = Piece(
-	Config( [ down, down, down ] ).create_all_rotated_flat(),
-	'purple (J)'
-)
-pieces.append(purple)
-
-lightgreen = Piece(
-	Config( [ right, down, left ] ).create_all_rotated_flat(),
-	'lightgreen (K)'
-)
-pieces.append(lightgreen)
-
-grey = Piece(
-	Config( [ down, [[ left ], [ down ], [ right ]] ] ).create_all_rotated_flat(),
-	'grey (L)'
-)
-pieces.append(grey)
-
+import os
+import sys
 
-output = output + 'vector<Piece*>* pieces = new vector<Piece*>;\n\n'
-output = output + 'Piece* piece;\n'
-output = output + 'Configuration* config;\n'
-output = output + 'Junction* junc0;\n'
-output = output + 'Junction* junc1;\n'
-output = output + 'Junction* junc2;\n'
-output = output + 'Junction* junc3;\n'
-output = output + 'Junction* junc4;\n\n'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))  # make the puzzle3d package importable
 
-for piece in pieces:
-	piece.create_all_configs()
+from puzzle3d import CodeEmitter, write_pieces_code
+from puzzle3d.puzzles import lonpos_flat
 
-output = output + 'return pieces;'
 
 with open('create_pieces_code.txt', 'w') as fp:
-	fp.write(output)
\ No newline at end of file
+	write_pieces_code(lonpos_flat.pieces, CodeEmitter(fp))
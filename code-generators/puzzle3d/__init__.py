@@ -0,0 +1,29 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Shared library for defining puzzles (lattice + pieces) and generating the corresponding C++ code.
+"""
+
+from .codegen import lattice_code, pieces_code, placements_code, write_lattice_code, write_pieces_code, write_placements_code
+from .emitter import CodeEmitter, write_header
+from .lattice import Lattice, rectangular_lattice, cone_lattice, pyramid_lattice
+from .pieces import Piece, Config
@@ -0,0 +1,82 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Generates the code for one or more puzzles in a single run:
+
+    python -m puzzle3d [puzzle ...] [--output-dir DIR] [--headers]
+
+For each puzzle the files create_lattice_code.txt, create_pieces_code.txt and create_placements_code.txt are written to DIR/<puzzle>/
+along with the puzzle file puzzle.npz (see puzzle3d.puzzlefile, requires NumPy), and the number of configurations per piece
+(along with the number of removed duplicates) is reported.
+With --headers the code is instead filled into copies of create_lattice.h, create_pieces.h and create_placements.h which are ready
+to be compiled with main.cpp.
+"""
+
+import argparse
+import os
+
+from . import puzzlefile, puzzles
+from .codegen import write_lattice_code, write_pieces_code, write_placements_code
+from .emitter import CodeEmitter, write_header
+from .pieces import duplicates_report
+from .placements import PlacementTable
+
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir)  # location of main.cpp and the header templates
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d', description='Generate the bodies of createLattice, createPieces and createCandidateCounts.')
+	parser.add_argument('puzzles', nargs='*', default=puzzles.PUZZLES, help='puzzles to generate (default: all), one of: %s' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--output-dir', default='.', help='directory in which one sub-directory per puzzle is created')
+	parser.add_argument('--headers', action='store_true', help='write filled create_lattice.h, create_pieces.h and create_placements.h instead of the code only')
+	args = parser.parse_args(argv)
+
+	for name in args.puzzles:
+		puzzle = puzzles.load(name)
+		table = PlacementTable.build(puzzle.lattice, puzzle.pieces)
+		print('%s:' % name)
+		for line in duplicates_report(puzzle.pieces):
+			print('    %s' % line)
+
+		directory = os.path.join(args.output_dir, name)
+		if not os.path.isdir(directory):
+			os.makedirs(directory)
+		puzzlefile.save(os.path.join(directory, 'puzzle.npz'), puzzle.lattice, puzzle.pieces)
+		if args.headers:
+			write_header(os.path.join(SOURCE_DIR, 'create_lattice.h'), os.path.join(directory, 'create_lattice.h'),
+			             lambda emitter: write_lattice_code(puzzle.lattice, emitter))
+			write_header(os.path.join(SOURCE_DIR, 'create_pieces.h'), os.path.join(directory, 'create_pieces.h'),
+			             lambda emitter: write_pieces_code(puzzle.pieces, emitter))
+			write_header(os.path.join(SOURCE_DIR, 'create_placements.h'), os.path.join(directory, 'create_placements.h'),
+			             lambda emitter: write_placements_code(table, emitter))
+		else:
+			with open(os.path.join(directory, 'create_lattice_code.txt'), 'w') as fp:
+				write_lattice_code(puzzle.lattice, CodeEmitter(fp))
+			with open(os.path.join(directory, 'create_pieces_code.txt'), 'w') as fp:
+				write_pieces_code(puzzle.pieces, CodeEmitter(fp))
+			with open(os.path.join(directory, 'create_placements_code.txt'), 'w') as fp:
+				write_placements_code(table, CodeEmitter(fp))
+
+
+if __name__ == '__main__':
+	main()
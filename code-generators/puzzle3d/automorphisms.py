@@ -0,0 +1,184 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Symmetries of a board and symmetry breaking for the solvers that work on a placement table.
+
+An automorphism of the lattice is a permutation of its sites which maps every link onto a link whose direction is the image of the
+original direction under one of the operations of the lattice's symmetry group (see symmetry.Symmetry). It is found by mapping
+the first site onto each site in turn and following the links from there. Only automorphisms which map the placements of every piece
+onto placements of the same piece are used, so each one maps solutions onto solutions.
+
+Symmetric copies of a solution are skipped by restricting a set of placements of which every solution contains exactly one, and which
+the automorphisms map onto itself, to one placement per orbit (the set of images of a placement). This is either the set of placements
+of a piece that every solution uses or the set of placements which cover a site (then only the automorphisms that leave the site in
+place are used); the one that keeps the fewest placements is chosen. Every solution has an image that contains one of the allowed
+placements, so each class of symmetric solutions is found at least once. A class is found more than once if an allowed placement is
+left in place by some of the automorphisms, or if only those fixing a site were used; `accept` keeps only the smallest of the allowed
+images of a solution under all automorphisms, so each class is reported once, and `expand` restores all solutions of a class, each
+exactly once.
+
+    python -m puzzle3d.bitboard <puzzle> --break-symmetry [--expand]
+"""
+
+from .symmetry import Symmetry
+
+
+def site_permutations(lattice):
+	"""
+	Returns the automorphisms of the (connected) lattice as lists which hold the index of the image of every site (scan order).
+	The identity comes first.
+	"""
+	sites = lattice.sites
+	site_ids = dict((site, i) for i, site in enumerate(sites))
+	neighbors = lattice.neighbors()
+	permutations = []
+	for operation in Symmetry.of(lattice).operations:
+		for image in sites:
+			mapping = {sites[0]: image}
+			stack = [sites[0]]
+			while stack and mapping is not None:
+				site = stack.pop()
+				for direction, neighbor in neighbors[site].items():
+					neighbor_image = neighbors[mapping[site]].get(operation[direction])
+					if neighbor_image is None or mapping.get(neighbor, neighbor_image) != neighbor_image:  # the link has no image
+						mapping = None
+						break
+					if neighbor not in mapping:
+						mapping[neighbor] = neighbor_image
+						stack.append(neighbor)
+			if mapping is not None and len(mapping) == len(sites) and len(set(mapping.values())) == len(sites):
+				permutation = [site_ids[mapping[site]] for site in sites]
+				if permutation not in permutations:
+					permutations.append(permutation)
+	if not permutations:  # lattice isn't connected
+		permutations.append(list(range(len(sites))))
+	return permutations
+
+
+def covered_sizes(sizes):
+	"""
+	Returns the numbers of sites that can be covered with at most one placement of every piece, given the sets of sizes of each piece's placements.
+	"""
+	totals = set([0])
+	for piece_sizes in sizes:
+		totals = totals | set(total + size for total in totals for size in piece_sizes)
+	return totals
+
+
+def placement_automorphisms(table, lattice):
+	"""
+	Returns the automorphisms which map the placements of every piece onto placements of the same piece, as list of
+	(site permutation, image of every placement). The identity comes first.
+	"""
+	placement_ids = dict(((piece, mask), placement) for placement, (piece, mask) in enumerate(zip(table.pieces, table.masks)))
+	automorphisms = []
+	for permutation in site_permutations(lattice):
+		images = []
+		for piece, mask in zip(table.pieces, table.masks):
+			image = 0
+			for site_id in range(table.n_sites):
+				if mask >> site_id & 1:
+					image = image | (1 << permutation[site_id])
+			images.append(placement_ids.get((piece, image)))
+		if None not in images:
+			automorphisms.append((permutation, images))
+	return automorphisms
+
+
+class SymmetryBreaking:
+	def __init__(self, table, lattice):
+		self.maps = []  # one list per automorphism which holds the image of every placement
+		fixed = []  # the sites that each of these automorphisms leaves in place
+		for permutation, images in placement_automorphisms(table, lattice):
+			self.maps.append(images)
+			fixed.append(set(site_id for site_id in range(table.n_sites) if permutation[site_id] == site_id))
+
+		# candidates for the restricted set of placements, along with the automorphisms that map it onto itself: the placements of
+		# every piece without which the board can't be filled and the placements covering each site
+		sizes = [set() for piece_id in range(table.n_pieces)]
+		for piece_id, mask in zip(table.pieces, table.masks):
+			sizes[piece_id].add(bin(mask).count('1'))
+		candidates = [('placements of piece %s' % table.symbols[piece_id],
+		               [placement for placement in range(len(table)) if table.pieces[placement] == piece_id], self.maps)
+		              for piece_id in range(table.n_pieces) if table.n_sites not in covered_sizes(sizes[:piece_id] + sizes[piece_id+1:])]
+		candidates.extend(('placements covering site %s' % (table.sites[site_id],),
+		                   [placement for placement in range(len(table)) if table.masks[placement] >> site_id & 1],
+		                   [images for images, sites in zip(self.maps, fixed) if site_id in sites])
+		                  for site_id in range(table.n_sites))
+
+		# choose the candidate for which the fewest placements remain; orbits[r] holds the orbit of placement r, sorted
+		best = None
+		for description, placements, maps in candidates:
+			orbits = {}
+			for placement in placements:
+				orbit = sorted(set(images[placement] for images in maps))
+				orbits[orbit[0]] = orbit
+			if placements and (best is None or len(orbits) / float(len(placements)) < best[0]):
+				best = (len(orbits) / float(len(placements)), description, placements, maps, orbits)
+		fraction, self.description, self.restricted, maps, orbits = best
+		self.excluded = set(placement for orbit in orbits.values() for placement in orbit[1:])  # placements the solver must skip
+
+	def __len__(self):
+		return len(self.maps)
+
+	def images(self, solution):
+		"""
+		Returns the distinct images of the given solution under all automorphisms as lists of placements, the solution itself first.
+		"""
+		distinct, seen = [], set()
+		for images in self.maps:  # the identity comes first
+			image = [images[placement] for placement in solution]
+			if frozenset(image) not in seen:
+				seen.add(frozenset(image))
+				distinct.append(image)
+		return distinct
+
+	def accept(self, solution):
+		"""
+		Returns whether the given solution (found with the restriction) is the one that represents its class: the smallest of its
+		images that the restriction allows as well.
+		"""
+		key = sorted(solution)
+		for images in self.maps:
+			image = [images[placement] for placement in solution]
+			if self.excluded.isdisjoint(image) and sorted(image) < key:
+				return False
+		return True
+
+	def multiplicity(self, solution):
+		"""
+		Returns the number of solutions that `expand` yields for the given solution.
+		"""
+		return len(self.images(solution))
+
+	def canonical(self, solution):
+		"""
+		Returns the same tuple of placements for all solutions that are symmetric copies of each other (under all automorphisms).
+		"""
+		return min(tuple(sorted(images[placement] for placement in solution)) for images in self.maps)
+
+	def expand(self, solution):
+		"""
+		Yields the given solution and all of its symmetric copies.
+		"""
+		for image in self.images(solution):
+			yield image
@@ -0,0 +1,258 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Compares the solvers on the shipped puzzles:
+
+    python -m puzzle3d.benchmark [puzzle ...] [--engines cpp,cpp-mrv,bitboard,bitboard-mrv,dlx] [--timeout SECONDS] [--max-steps N]
+
+Every solver runs as a separate process which enumerates all solutions; the reported time is the wall time of that process, and
+runs that take longer than the timeout are stopped and reported as such. Along with it the number of placements the solver made
+(nodes of the search tree, as reported on stderr) and the placements per second are reported. The Python solvers can't finish
+every puzzle within a reasonable time, so with --max-steps N each solver stops after N placements instead: the solutions are then
+those found in this part of the search, and the placements per second compare the engines on puzzles that only some can finish.
+Engines which fill sites in a different order explore different trees, so their rates measure the cost per node only. For the C++ solver, main.cpp is compiled (with $CXX,
+default g++) together with the generated create_lattice.h, create_pieces.h and create_placements.h once per puzzle beforehand;
+compilation is not part of the reported time. Engine cpp-mrv runs it with --mrv.
+
+With --startup N, N fresh worker processes set up the bitboard solver (mrv order, which uses all placement data) for each puzzle,
+once by building the placement table from the puzzle definition and once by memory-mapping a saved table (as puzzle3d.parallel and
+puzzle3d.stealing do), and then search for --startup-steps placements, so that data which the solver copies on first use is
+counted as well. Startup time and memory are reported per worker, the memory as resident set size (RSS), proportional set size
+(PSS, pages shared by several processes are split between them) and unique set size (USS, pages used by this process only) after
+the search steps while all workers are alive (Linux only, see memory_usage).
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import puzzles
+from .codegen import write_lattice_code, write_pieces_code, write_placements_code
+from .bitboard import Search, Solver
+from .emitter import write_header
+from .placements import PlacementTable, cache_directory
+
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir)  # location of main.cpp and the header templates
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)  # directory which contains the puzzle3d package
+
+ENGINES = ['cpp', 'cpp-mrv', 'bitboard', 'bitboard-mrv', 'dlx']
+CPP_ENGINES = {  # options of the compiled C++ solver
+	'cpp': (),
+	'cpp-mrv': ('--mrv',),
+}
+PYTHON_ENGINES = {  # module and options of the Python solvers
+	'bitboard': ('bitboard',),
+	'bitboard-mrv': ('bitboard', '--order', 'mrv'),
+	'dlx': ('dlx',),
+}
+DEFAULT_PUZZLES = ['lonpos_flat', 'lonpos_pyramid_4x4', 'lonpos_pyramid_5x5', 'lonpos_crazy_cone', 'iqfit']
+DEFAULT_TIMEOUT = 600  # seconds per run
+STARTUP_STEPS = 200000  # placements that every startup worker makes before its memory is measured
+
+
+def compile_cpp(name, directory):
+	"""
+	Compiles the C++ solver for the specified puzzle in `directory` and returns the path of the executable.
+	"""
+	puzzle = puzzles.load(name)
+	for filename in os.listdir(SOURCE_DIR):
+		if filename.endswith('.cpp') or filename.endswith('.h'):
+			shutil.copy(os.path.join(SOURCE_DIR, filename), directory)
+	write_header(os.path.join(SOURCE_DIR, 'create_lattice.h'), os.path.join(directory, 'create_lattice.h'),
+	             lambda emitter: write_lattice_code(puzzle.lattice, emitter))
+	write_header(os.path.join(SOURCE_DIR, 'create_pieces.h'), os.path.join(directory, 'create_pieces.h'),
+	             lambda emitter: write_pieces_code(puzzle.pieces, emitter))
+	table = PlacementTable.build(puzzle.lattice, puzzle.pieces)
+	write_header(os.path.join(SOURCE_DIR, 'create_placements.h'), os.path.join(directory, 'create_placements.h'),
+	             lambda emitter: write_placements_code(table, emitter))
+	executable = os.path.join(directory, 'solver')
+	sources = sorted(filename for filename in os.listdir(directory) if filename.endswith('.cpp'))
+	subprocess.check_call([os.environ.get('CXX', 'g++'), '-O2', '-o', executable] + sources, cwd=directory)
+	return executable
+
+
+def run(command, timeout):
+	"""
+	Runs a solver and returns (number of solutions, number of placements, wall time in seconds), where the numbers are None if the
+	solver timed out.
+	"""
+	start_time = time.time()
+	process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=PACKAGE_DIR)
+	try:
+		output, errors = process.communicate(timeout=timeout)
+	except subprocess.TimeoutExpired:
+		process.kill()
+		process.communicate()
+		return None, None, time.time() - start_time
+	elapsed = time.time() - start_time
+	if process.returncode != 0:
+		raise RuntimeError('%s exited with status %d' % (' '.join(command), process.returncode))
+	return len(output.splitlines()), parse_placements(errors.decode()), elapsed
+
+
+def parse_placements(report):
+	"""
+	Returns the number of placements from the statistics that a solver writes to stderr (None if it isn't reported).
+	"""
+	for line in report.splitlines():
+		for prefix in ('number of placements:', 'number of nodes visited:'):  # Python solvers, C++ solver
+			if line.startswith(prefix):
+				return int(line[len(prefix):])
+	return None
+
+
+def python_command(engine, name, *options):
+	module = PYTHON_ENGINES[engine][0]
+	return [sys.executable, '-m', 'puzzle3d.%s' % module, name] + list(PYTHON_ENGINES[engine][1:]) + list(options)
+
+
+def benchmark(names, engines, timeout, max_steps=None):
+	"""
+	Yields (puzzle, engine, number of solutions, number of placements, seconds) for all combinations of puzzles and engines.
+	"""
+	options = ('--max-steps', str(max_steps)) if max_steps is not None else ()
+	for name in names:
+		directory = None  # the C++ solver is compiled once per puzzle
+		try:
+			for engine in engines:
+				if engine in CPP_ENGINES:
+					if directory is None:
+						directory = tempfile.mkdtemp()
+						executable = compile_cpp(name, directory)
+					n_solutions, n_placements, seconds = run([executable] + list(CPP_ENGINES[engine]) + list(options), timeout)
+				else:
+					n_solutions, n_placements, seconds = run(python_command(engine, name, *options), timeout)
+				yield name, engine, n_solutions, n_placements, seconds
+		finally:
+			if directory is not None:
+				shutil.rmtree(directory)
+
+
+def memory_usage():
+	"""
+	Returns (RSS, PSS, USS) of the current process in kB, read from /proc/self/smaps_rollup.
+	"""
+	sizes = {}
+	with open('/proc/self/smaps_rollup') as fp:
+		for line in fp:
+			fields = line.split()
+			if len(fields) == 3 and fields[2] == 'kB':
+				sizes[fields[0].rstrip(':')] = int(fields[1])
+	return sizes['Rss'], sizes['Pss'], sizes['Private_Clean'] + sizes['Private_Dirty']
+
+
+def _startup(args):
+	"""
+	Runs in a fresh worker process: sets up the bitboard solver with a table that is built (if `directory` is None) or memory-mapped
+	and makes `steps` placements. Waits at `barrier` until all workers got this far, so shared pages are counted while every worker
+	maps them. Returns (setup seconds, RSS in kB, PSS in kB, USS in kB).
+	"""
+	name, directory, steps = args
+	start_time = time.time()
+	if directory is None:
+		puzzle = puzzles.load(name)
+		table = PlacementTable.build(puzzle.lattice, puzzle.pieces)
+	else:
+		table = PlacementTable.load_mapped(directory)
+	solver = Solver(table, 'mrv')
+	seconds = time.time() - start_time
+	search = Search(solver)
+	for solution in search.run(max_steps=steps):
+		pass
+	_barrier.wait()
+	rss, pss, uss = memory_usage()
+	_barrier.wait()  # no worker exits (or drops the search) before all of them have measured
+	del search
+	return seconds, rss, pss, uss
+
+
+_barrier = None  # shared by the workers of one startup pool
+
+
+def _init_startup(barrier):
+	global _barrier
+	_barrier = barrier
+
+
+def startup(names, workers, steps=STARTUP_STEPS):
+	"""
+	Yields (puzzle, loading, [(seconds, RSS in kB, PSS in kB, USS in kB) per worker]) where loading is 'build' or 'mapped'.
+	"""
+	context = multiprocessing.get_context('spawn')  # every worker starts from scratch
+	for name in names:
+		directory = tempfile.mkdtemp()
+		try:
+			PlacementTable.for_puzzle(name, directory)
+			for loading, path in [('build', None), ('mapped', cache_directory(name, directory))]:
+				pool = context.Pool(workers, _init_startup, (context.Barrier(workers),), maxtasksperchild=1)
+				try:
+					yield name, loading, pool.map(_startup, [(name, path, steps)] * workers, chunksize=1)
+				finally:
+					pool.close()
+					pool.join()
+		finally:
+			shutil.rmtree(directory)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.benchmark', description='Compare the solvers on the shipped puzzles.')
+	parser.add_argument('puzzles', nargs='*', default=DEFAULT_PUZZLES, help='puzzles to solve (default: %s)' % ', '.join(DEFAULT_PUZZLES))
+	parser.add_argument('--engines', default=','.join(ENGINES), help='comma separated list of solvers (default: %s)' % ','.join(ENGINES))
+	parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='maximum number of seconds per run (default: %d)' % DEFAULT_TIMEOUT)
+	parser.add_argument('--max-steps', type=int, metavar='N', help='stop every solver after N placements')
+	parser.add_argument('--startup', type=int, default=0, metavar='N', help='also report startup time and memory of N worker processes')
+	parser.add_argument('--startup-steps', type=int, default=STARTUP_STEPS, metavar='STEPS',
+	                    help='placements that each of these workers makes before its memory is measured (default: %d)' % STARTUP_STEPS)
+	args = parser.parse_args(argv)
+
+	engines = [engine for engine in args.engines.split(',') if engine]  # --engines '' only reports the startup
+	for engine in engines:
+		if engine not in ENGINES:
+			parser.error('unknown engine: %s' % engine)
+
+	if engines:
+		print('%-20s %-12s %12s %12s %12s %14s' % ('puzzle', 'engine', 'solutions', 'placements', 'seconds', 'placements/s'))
+	for name, engine, n_solutions, n_placements, seconds in benchmark(args.puzzles, engines, args.timeout, args.max_steps):
+		if n_solutions is None:
+			print('%-20s %-12s %12s %12s %12.2f %14s' % (name, engine, 'timeout', '', seconds, ''))
+		else:
+			print('%-20s %-12s %12d %12d %12.2f %14.0f' % (name, engine, n_solutions, n_placements, seconds, n_placements / seconds))
+		sys.stdout.flush()
+
+	if args.startup > 0:
+		if engines:
+			print('')
+		print('%-20s %-8s %8s %12s %12s %12s %12s' % ('puzzle', 'loading', 'worker', 'seconds', 'RSS (MB)', 'PSS (MB)', 'USS (MB)'))
+		for name, loading, workers in startup(args.puzzles, args.startup, args.startup_steps):
+			for i, (seconds, rss, pss, uss) in enumerate(workers):
+				print('%-20s %-8s %8d %12.3f %12.1f %12.1f %12.1f' % (name, loading, i, seconds, rss / 1024.0, pss / 1024.0, uss / 1024.0))
+			sys.stdout.flush()
+
+
+if __name__ == '__main__':
+	main()
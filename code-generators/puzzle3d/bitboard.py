@@ -0,0 +1,325 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Solves a puzzle on a bitboard, i.e. the occupied sites of the lattice are stored in a single int:
+
+    python -m puzzle3d.bitboard <puzzle>
+
+Like the C++ solver it always fills the first free site (in scan order) next. Since all sites before it are occupied,
+only placements whose first covered site is the free site can succeed; they are looked up in a table that is built once
+from the placement table. A placement fits if `board & mask == 0`, placing and removing it is `board ^= mask`.
+
+With `--order mrv` it fills the most constrained free site next instead, i.e. the one that is covered by the fewest placements
+which still fit (minimum remaining values). These numbers are updated incrementally while placements are made and taken back
+(see puzzle3d.counts). This costs more per node but usually explores far fewer nodes.
+
+Solutions are printed in the same format as Lattice::toStringLightweight unless another output is selected (see puzzle3d.sink).
+"""
+
+import argparse
+import copy
+import sys
+import time
+
+from . import puzzles, sink
+from .automorphisms import SymmetryBreaking
+from .counts import CandidateCounts
+from .placements import PlacementTable
+
+
+def lowest_bit(mask):
+	"""
+	Returns the index of the lowest set bit of `mask`.
+	"""
+	return (mask & -mask).bit_length() - 1
+
+
+class SiteCandidates(dict):
+	"""
+	Maps a site index to the list of (mask, piece bit, placement) of the placements in `placements[site]` that aren't excluded.
+	A list is only built when its site is looked up first, so the placement data of a memory-mapped table isn't copied up front.
+	"""
+	def __init__(self, table, placements, excluded):
+		dict.__init__(self)
+		self.table = table
+		self.placements = placements
+		self.excluded = excluded
+
+	def __missing__(self, site_id):
+		masks, pieces = self.table.masks, self.table.pieces
+		candidates = [(masks[placement], 1 << pieces[placement], placement) for placement in self.placements[site_id] if placement not in self.excluded]
+		self[site_id] = candidates
+		return candidates
+
+
+ORDERS = ['scan', 'mrv']  # which free site is filled next: the first one in scan order or the most constrained one
+
+
+class Solver:
+	def __init__(self, table, order='scan', excluded=()):
+		"""
+		Placements in `excluded` are never made (see automorphisms.SymmetryBreaking).
+		"""
+		if order not in ORDERS:
+			raise ValueError('unknown order: %s' % order)
+		self.table = table
+		self.order = order
+		self.full = (1 << table.n_sites) - 1  # all sites occupied
+
+		excluded = frozenset(excluded)
+		self.candidates = SiteCandidates(table, table.starting, excluded)  # candidates[i] holds (mask, piece bit, placement) of all placements whose first site is i
+		self.covering = SiteCandidates(table, table.covering, excluded)  # covering[i] holds the same for all placements which cover site i
+		self.counts = CandidateCounts.from_table(table, excluded) if order == 'mrv' else None  # copied (empty) by every search
+
+	def choose(self, board, counts=None):
+		"""
+		Returns the candidates (mask, piece bit, placement) for the next free site: all placements starting at the first free site
+		(scan order) or the placements that fit on the free site with the fewest of them (mrv order, requires the search's counts).
+		"""
+		if counts is None:
+			return self.candidates[lowest_bit(~board & self.full)]
+		blocked = counts.blocked
+		return [candidate for candidate in self.covering[counts.argmin()] if not blocked[candidate[2]]]
+
+	def state(self, placements):
+		"""
+		Returns (board, used) after the given placements where `used` holds one bit per used piece.
+		"""
+		board = 0
+		used = 0
+		for placement in placements:
+			board = board | self.table.masks[placement]
+			used = used | (1 << self.table.pieces[placement])
+		return board, used
+
+	def solve(self, placements=()):
+		"""
+		Yields every solution as list of placement indices. The search can start from a partially filled board given by `placements`.
+		"""
+		return Search(self, placements).run()
+
+	def count(self, placements=()):
+		"""
+		Returns the number of solutions per top-level branch as dict {first placement: solutions}, without building any solution.
+		"""
+		branches = {}
+		for solution in Search(self, placements).run(branches=branches):
+			pass
+		return branches
+
+	def describe(self, placement):
+		"""
+		Returns a short description of a placement (piece symbol, configuration and the site of its seed) for reports.
+		"""
+		table = self.table
+		return '%s/%d at %s' % (table.symbols[table.pieces[placement]], table.configs[placement], table.sites[table.anchors[placement]])
+
+
+class Search:
+	"""
+	Depth-first search with an explicit stack. It can be advanced a limited number of steps at a time and unexplored parts of it can be split off.
+	"""
+	def __init__(self, solver, placements=()):
+		self.solver = solver
+		self.placements = list(placements)
+		self.depth = len(self.placements)  # number of placements that the search started with
+		self.board, self.used = solver.state(self.placements)
+		self.steps = 0  # number of placements made so far
+		self.stack = []  # per level: candidates of the next free site and the index of the next one to try
+		self.counts = None
+		if solver.counts is not None:
+			self.counts = copy.copy(solver.counts)
+			self.counts.reset()
+			for placement in self.placements:
+				self.counts.place(placement)
+		self.complete = self.board == solver.full  # the initial placements are a solution already
+		if not self.complete:
+			self.stack.append([solver.choose(self.board, self.counts), 0])
+
+	@property
+	def finished(self):
+		return not self.stack and not self.complete
+
+	def run(self, max_steps=None, branches=None):
+		"""
+		Yields solutions (lists of placement indices) until the search is finished or `max_steps` placements have been made.
+		If `branches` is given (a dict), solutions are only counted in it per top-level branch, i.e. per first placement, instead.
+		"""
+		if self.complete:
+			self.complete = False
+			if branches is None:
+				yield list(self.placements)
+			elif self.placements:
+				branches[self.placements[0]] = branches.get(self.placements[0], 0) + 1
+
+		full = self.solver.full
+		candidates = self.solver.candidates
+		choose = self.solver.choose
+		counts = self.counts  # None in scan order, which is looked up inline
+		masks = self.solver.table.masks
+		pieces = self.solver.table.pieces
+		placements = self.placements
+		stack = self.stack
+		depth = self.depth
+		board = self.board
+		used = self.used
+		steps = 0
+		try:
+			while stack:
+				if steps == max_steps:
+					return
+				level = stack[-1]
+				site_candidates, i = level
+				n_candidates = len(site_candidates)
+				while i < n_candidates:
+					mask, piece, placement = site_candidates[i]
+					i = i + 1
+					if not (board & mask or used & piece):
+						break
+				else:  # all candidates tried, backtrack
+					stack.pop()
+					if len(placements) > depth:
+						placement = placements.pop()
+						board = board ^ masks[placement]
+						used = used ^ (1 << pieces[placement])
+						if counts is not None:
+							counts.remove(placement)
+					continue
+
+				level[1] = i
+				steps = steps + 1
+				board = board | mask
+				used = used | piece
+				placements.append(placement)
+				if board == full:
+					if branches is None:
+						self.board, self.used = board ^ mask, used ^ piece  # consistent state while the solution is consumed
+						yield list(placements)
+					else:
+						branches[placements[0]] = branches.get(placements[0], 0) + 1
+					placements.pop()
+					board = board ^ mask
+					used = used ^ piece
+				elif counts is None:
+					stack.append([candidates[lowest_bit(~board & full)], 0])
+				else:
+					counts.place(placement)
+					stack.append([choose(board, counts), 0])
+		finally:
+			self.board = board
+			self.used = used
+			self.steps = self.steps + steps
+
+	def split(self):
+		"""
+		Removes the untried candidates from the shallowest level that still has some and returns them as nodes, i.e. as lists of
+		placements which start a new search each. Candidates that don't fit are skipped.
+		"""
+		for level_id, level in enumerate(self.stack[:-1]):  # the deepest level is left to this search
+			site_candidates, i = level
+			if i == len(site_candidates):
+				continue
+			prefix = self.placements[:self.depth+level_id]
+			board, used = self.solver.state(prefix)
+			nodes = [prefix + [placement] for mask, piece, placement in site_candidates[i:] if not (board & mask or used & piece)]
+			level[1] = len(site_candidates)
+			if nodes:
+				return nodes
+		return []
+
+
+def write_branches(solver, branches, fp=None):
+	"""
+	Writes the number of solutions per top-level branch (see Search.run) to `fp` (default: stdout), one line per first placement.
+	"""
+	fp = sys.stdout if fp is None else fp
+	for placement in sorted(branches):
+		fp.write('%6d  %-24s %10d\n' % (placement, solver.describe(placement), branches[placement]))
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.bitboard', description='Find all solutions of a puzzle on a bitboard.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--order', choices=ORDERS, default='scan', help='which free site is filled next (default: scan)')
+	parser.add_argument('--cache-dir', help='load (or save) the placement table from (to) this directory')
+	parser.add_argument('--break-symmetry', action='store_true', help='find only one solution per class of solutions that are symmetric copies of each other')
+	parser.add_argument('--expand', action='store_true', help='with --break-symmetry: write all solutions of each class')
+	parser.add_argument('--count', action='store_true', help='only count the solutions (per first placement) instead of writing them')
+	parser.add_argument('--max-steps', type=int, metavar='N', help='stop after N placements (the counts cover only this part of the search)')
+	sink.add_arguments(parser)
+	args = parser.parse_args(argv)
+	if args.count and args.break_symmetry:
+		parser.error('--count can\'t be combined with --break-symmetry')
+
+	start_time = time.time()
+	table = PlacementTable.for_puzzle(args.puzzle, args.cache_dir)
+	symmetry = None
+	if args.break_symmetry:
+		symmetry = SymmetryBreaking(table, puzzles.load(args.puzzle).lattice)
+		sys.stderr.write('%d board symmetries, %s restricted to %d of %d\n'
+		                 % (len(symmetry), symmetry.description, len(symmetry.restricted) - len(symmetry.excluded), len(symmetry.restricted)))
+	solver = Solver(table, args.order, symmetry.excluded if symmetry is not None else ())
+	search = Search(solver)
+	if args.count:
+		branches = {}
+		for solution in search.run(max_steps=args.max_steps, branches=branches):
+			pass
+		write_branches(solver, branches)
+		sys.stderr.write('computing time: %.2f seconds\n' % (time.time() - start_time))
+		sys.stderr.write('number of placements: %d\n' % search.steps)
+		sys.stderr.write('number of solutions found: %d\n' % sum(branches.values()))
+		return
+	counts = [0, 0]  # solutions found with the restriction and solutions in total
+	classes = set()  # canonical form of every class of symmetric solutions
+
+	def solutions():
+		for solution in search.run(max_steps=args.max_steps):
+			counts[0] = counts[0] + 1
+			if symmetry is not None:
+				classes.add(symmetry.canonical(solution))
+				if not symmetry.accept(solution):  # another image of it represents the class
+					continue
+			if symmetry is None:
+				counts[1] = counts[1] + 1
+				yield solution
+			elif args.expand:
+				for image in symmetry.expand(solution):
+					counts[1] = counts[1] + 1
+					yield image
+			else:
+				counts[1] = counts[1] + symmetry.multiplicity(solution)
+				yield solution
+
+	with sink.open_sink(table, args) as output:
+		output.write_all(solutions())
+	n_restricted, n_solutions = counts
+
+	sys.stderr.write('computing time: %.2f seconds\n' % (time.time() - start_time))
+	sys.stderr.write('number of placements: %d\n' % search.steps)
+	if symmetry is not None:
+		sys.stderr.write('number of solutions found with the restriction: %d\n' % n_restricted)
+		sys.stderr.write('number of classes of symmetric solutions: %d\n' % len(classes))
+	sys.stderr.write('number of solutions found: %d\n' % n_solutions)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,151 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Generates the bodies of the `createLattice`, `createPieces` and `createCandidateCounts` functions
+(see create_lattice.h, create_pieces.h and create_placements.h).
+"""
+
+from .directions import direction_id
+from .emitter import CodeEmitter
+from .geometry import tree
+
+
+def site_name(site):
+	"""
+	Returns the C++ identifier of a lattice site; the indices are separated so that it stays unique once an index reaches 10.
+	"""
+	return 'site_%d_%d_%d' % (site[2], site[1], site[0])
+
+
+def write_lattice_code(lattice, emitter):
+	emitter.write('Lattice* lattice = new Lattice;\n')  # create lattice
+	emitter.write('Layer* layer;\n')
+	emitter.write('Row* row;\n')
+	emitter.write('\n')
+
+	for layer in lattice.layers:
+
+		emitter.write('layer = new Layer;\n')  # create new layer
+		emitter.write('lattice->layers.push_back(layer);\n')  # add layer to lattice
+		emitter.write('layer->lattice = lattice;\n')  # set reverse accessor
+		emitter.write('\n')
+
+		for row in layer:
+
+			emitter.write('row = new Row;\n')  # create new row
+			emitter.write('layer->rows.push_back(row);\n')  # add row to layer
+			emitter.write('row->layer = layer;\n')  # set reverse accessor
+			emitter.write('\n')
+
+			for site in row:
+
+				emitter.write('LatticeSite* %s = new LatticeSite(%d,%d,%d);\n' % (site_name(site), site[0], site[1], site[2]))  # create new lattice site
+				emitter.write('row->sites.push_back(%s);\n' % site_name(site))  # add site to row
+				emitter.write('%s->row = row;\n' % site_name(site))  # set reverse accessor
+				emitter.write('\n')
+
+	emitter.write('\n')
+
+	names = [site_name(site) for site in lattice.sites]
+	for i, (src, dst, dx, dy, dz) in enumerate(lattice.link_array().tolist()):
+		emitter.write('%s->neighbors.push_back(%s);\n' % (names[src], names[dst]))
+		emitter.write('%s->links.push_back(new Vector3d(%d,%d,%d));\n' % (names[src], dx, dy, dz))
+		emitter.write('%s->neighborsByDirection[%d] = %s;\n' % (names[src], direction_id((dx, dy, dz)), names[dst]))
+		emitter.write('\n' if i % 2 == 0 else '\n\n')  # site and counterpart are separated by one, pairs of them by two blank lines
+
+	emitter.write('return lattice;')
+
+
+def lattice_code(lattice):
+	emitter = CodeEmitter()
+	write_lattice_code(lattice, emitter)
+	return emitter.getvalue()
+
+
+class PiecesCode:
+	def __init__(self, emitter):
+		self.emitter = emitter  # receives the generated code
+		self.n_configs = 0  # number of configurations that were already generated (names their arrays)
+
+	def start(self, links, start_comments=[], end_comments=[]):
+		"""
+		Writes a configuration as flat array with one pair (index of the preceding junction, direction id) per junction.
+		Junctions are numbered as by geometry.tree, so every junction follows its preceding junction; the seed comes first and has the pair (-1, -1).
+		"""
+		positions, edges = tree(links)
+		pairs = [(-1, -1)] * len(positions)
+		for prev_id, branches in enumerate(edges):
+			for next_id, direction in branches:
+				pairs[next_id] = (prev_id, direction_id(direction))
+
+		self.emitter.write('\n'.join('// '+comment for comment in start_comments) + '\n')  # write start comments, if any
+		self.emitter.write('static const int config%d[] = {%s};\n' % (self.n_configs, ', '.join('%d,%d' % pair for pair in pairs)))
+		self.emitter.write('piece->configs.push_back(new Configuration(config%d, %d));\n' % (self.n_configs, len(pairs)))  # add configuration to piece
+		self.emitter.write('\n'.join('// '+comment for comment in end_comments))  # write end comments, if any
+		self.emitter.write('\n')
+		self.n_configs = self.n_configs + 1
+
+	def create_all_configs(self, piece):
+		self.emitter.write('// ---------- %s ----------\n' % piece.identifier)  # write identifier
+		self.emitter.write("piece = new Piece('%s');\n" % piece.symbol)  # create piece
+		self.emitter.write('pieces->push_back(piece);\n')  # add piece to list of pieces
+		for config in piece.configs:  # create all configurations
+			self.start(config.links)
+		self.emitter.write('// ---------- END %s END ----------\n' % piece.identifier)  # indicate this piece is complete
+		self.emitter.write('\n\n')
+
+
+def write_pieces_code(pieces, emitter):
+	emitter.write('vector<Piece*>* pieces = new vector<Piece*>;\n\n')
+	emitter.write('Piece* piece;\n')
+	emitter.write('\n')
+
+	code = PiecesCode(emitter)
+	for piece in pieces:
+		code.create_all_configs(piece)
+
+	emitter.write('return pieces;')
+
+
+def pieces_code(pieces):
+	emitter = CodeEmitter()
+	write_pieces_code(pieces, emitter)
+	return emitter.getvalue()
+
+
+def write_placements_code(table, emitter):
+	"""
+	Writes the placement table (see placements.PlacementTable) as data for a CandidateCounts object:
+	piece index, config index, anchor site, number of sites and the covered sites (indices in scan order) of each placement.
+	"""
+	emitter.write('static const int data[] = {\n')
+	for piece_id, config_id, anchor, mask in zip(table.pieces, table.configs, table.anchors, table.masks):
+		site_ids = [site_id for site_id in range(table.n_sites) if mask >> site_id & 1]
+		emitter.write('    %s,\n' % ', '.join(str(number) for number in [piece_id, config_id, anchor, len(site_ids)] + site_ids))
+	emitter.write('};\n')
+	emitter.write('return new CandidateCounts(%d, data, sizeof(data) / sizeof(data[0]));' % table.n_sites)
+
+
+def placements_code(table):
+	emitter = CodeEmitter()
+	write_placements_code(table, emitter)
+	return emitter.getvalue()
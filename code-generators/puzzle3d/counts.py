@@ -0,0 +1,148 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Number of fitting placements per free site, kept up to date while placements are made and taken back.
+
+A placement fits as long as none of the placements made so far conflicts with it (covers one of its sites or uses the same piece).
+Making a placement blocks all placements that conflict with it and decrements the counts of their sites; taking it back (in reverse
+order) undoes this. Free sites are kept in buckets by count, each an int with one bit per site, so the most constrained free site
+(the first one in scan order among those with the fewest fitting placements) is found without looking at every site.
+
+The C++ solver uses the same structure (candidatecounts.h), filled by the code from codegen.write_placements_code.
+"""
+
+from .placements import materialized
+
+
+class CandidateCounts:
+	def __init__(self, sites, covering, conflicts, reach, excluded=()):
+		"""
+		For every placement `sites` holds the covered sites, `conflicts` the placements that can't be combined with it (including
+		itself) and `reach` all sites whose count can change when it is made (covered by a conflicting placement); `covering` holds
+		the placements which cover each site (see PlacementTable.covered and the following properties). Placements in `excluded`
+		never fit: they are blocked from the start. Conflicts and reach (the bulk of the data) are used as given, e.g. as views of
+		a memory-mapped table, so processes that map the same table share them.
+		"""
+		self.n_placements = len(sites)
+		self.sites = materialized(sites)
+		self.covering = covering
+		self.conflicts = conflicts
+		self.reach = reach
+		self.excluded = excluded
+		self.initial_counts = [sum(1 for placement in placements if placement not in excluded) for placements in covering]
+		self.reset()
+
+	@classmethod
+	def from_table(cls, table, excluded=()):
+		return cls(table.covered, table.covering, table.conflicts, table.reach, excluded)
+
+	def reset(self):
+		"""
+		Takes back all placements. The placement data isn't changed by any method, so copies (copy.copy) that are reset can be
+		used by independent searches.
+		"""
+		self.blocked = [0] * self.n_placements  # number of made placements that conflict with each placement
+		for placement in self.excluded:
+			self.blocked[placement] = 1
+		self.counts = list(self.initial_counts)  # number of fitting placements which cover each site
+		self.free = [True] * len(self.covering)
+		self.n_free = len(self.covering)
+		self.buckets = [0] * (max(self.counts + [0]) + 1)  # free sites by count, one bit per site
+		for site_id, count in enumerate(self.counts):
+			self.buckets[count] = self.buckets[count] | (1 << site_id)
+		self.low = 0  # no free site has a smaller count
+
+	def place(self, placement):
+		counts, buckets, free, blocked, sites = self.counts, self.buckets, self.free, self.blocked, self.sites
+		for site_id in sites[placement]:
+			buckets[counts[site_id]] = buckets[counts[site_id]] ^ (1 << site_id)
+			free[site_id] = False
+		self.n_free = self.n_free - len(sites[placement])
+
+		reach = self.reach[placement]
+		before = [counts[site_id] for site_id in reach]  # only these counts can change
+		for other in self.conflicts[placement]:
+			blocked[other] = blocked[other] + 1
+			if blocked[other] == 1:
+				for site_id in sites[other]:
+					counts[site_id] = counts[site_id] - 1
+
+		low = self.low
+		for site_id, old in zip(reach, before):  # move every changed free site to its new bucket once
+			count = counts[site_id]
+			if free[site_id] and count != old:
+				buckets[old] = buckets[old] ^ (1 << site_id)
+				buckets[count] = buckets[count] | (1 << site_id)
+				if count < low:
+					low = count
+		self.low = low
+
+	def remove(self, placement):
+		"""
+		Takes back `placement`, which must be the last placement that was made and not taken back yet.
+		"""
+		counts, buckets, free, blocked, sites = self.counts, self.buckets, self.free, self.blocked, self.sites
+		reach = self.reach[placement]
+		before = [counts[site_id] for site_id in reach]
+		for other in self.conflicts[placement]:
+			blocked[other] = blocked[other] - 1
+			if blocked[other] == 0:
+				for site_id in sites[other]:
+					counts[site_id] = counts[site_id] + 1
+
+		for site_id, old in zip(reach, before):
+			if free[site_id] and counts[site_id] != old:
+				buckets[old] = buckets[old] ^ (1 << site_id)
+				buckets[counts[site_id]] = buckets[counts[site_id]] | (1 << site_id)
+
+		low = self.low
+		for site_id in sites[placement]:
+			free[site_id] = True
+			buckets[counts[site_id]] = buckets[counts[site_id]] | (1 << site_id)
+			if counts[site_id] < low:
+				low = counts[site_id]
+		self.low = low
+		self.n_free = self.n_free + len(sites[placement])
+
+	def argmin(self):
+		"""
+		Returns the free site with the fewest fitting placements (the first one in scan order if there are several, like the C++
+		CandidateCounts::argmin) or None if all sites are occupied.
+		The search for the smallest non-empty bucket starts at a lower bound that only drops when a count drops or a site is freed,
+		so it takes constant time amortised over the updates.
+		"""
+		if self.n_free == 0:
+			return None
+		buckets = self.buckets
+		low = self.low
+		while not buckets[low]:
+			low = low + 1
+		self.low = low
+		bucket = buckets[low]
+		return (bucket & -bucket).bit_length() - 1
+
+	def fitting(self, site_id):
+		"""
+		Returns the fitting placements which cover the given site.
+		"""
+		blocked = self.blocked
+		return [placement for placement in self.covering[site_id] if not blocked[placement]]
@@ -0,0 +1,259 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Merges solution files of a puzzle, drops duplicates and groups the solutions into classes of symmetric copies (requires NumPy):
+
+    python -m puzzle3d.dedup <puzzle> FILE [FILE ...] [--format text|bytes|ids] [--summary]
+
+The files may be in any format of puzzle3d.sink (the default is toStringLightweight lines, as written by the C++ solver).
+Every solution is mapped onto its images under the board's automorphisms (see puzzle3d.automorphisms) and the image with the
+smallest hash is its canonical form, which is the same for all solutions of a class. Only 64-bit hashes of the solutions are
+kept, in sorted NumPy arrays, so tens of millions of solutions fit in memory (solutions with equal hashes are taken as equal).
+
+For every class one line is printed with the canonical form, the number of distinct solutions and the number of occurrences in
+the files (with --summary only the totals and the distribution of class sizes are reported).
+"""
+
+import argparse
+import sys
+import time
+
+from . import puzzles
+from .automorphisms import placement_automorphisms
+from .placements import PlacementTable
+from .sink import FORMATS, read_solutions
+
+
+BATCH_SIZE = 1 << 16  # number of solutions that are hashed at once
+
+
+def hash_rows(rows, keys):
+	"""
+	Returns a 64-bit hash of every row of the given uint8 array; `keys` holds one random odd uint64 per column.
+	"""
+	import numpy as np
+
+	hashes = (rows.astype(np.uint64) * keys).sum(axis=1, dtype=np.uint64)  # wraps around modulo 2**64
+	hashes = hashes ^ (hashes >> np.uint64(30))  # finalizer of splitmix64
+	hashes = hashes * np.uint64(0xbf58476d1ce4e5b9)
+	hashes = hashes ^ (hashes >> np.uint64(27))
+	hashes = hashes * np.uint64(0x94d049bb133111eb)
+	return hashes ^ (hashes >> np.uint64(31))
+
+
+class SolutionIndex:
+	"""
+	Distinct solutions and classes of symmetric solutions, stored as sorted arrays of 64-bit hashes.
+
+	Each batch of solutions becomes a sorted run; whenever the last run is at least half as long as the one before, the two are
+	merged (like the runs of a merge sort), so there are O(log n) runs and every hash takes part in O(log n) merges.
+	"""
+	def __init__(self, permutations, n_sites, representatives=True):
+		import numpy as np
+
+		self.permutations = [np.array(permutation, dtype=np.intp) for permutation in permutations]
+		self.n_sites = n_sites
+		self.keys = np.random.RandomState(0).randint(0, 1 << 62, size=n_sites, dtype=np.int64).astype(np.uint64) * np.uint64(2) + np.uint64(1)
+		self.with_representatives = representatives
+		self.read = 0  # number of solutions added
+		self.solution_runs = []  # sorted runs of distinct solution hashes, disjoint from each other
+		self.class_runs = []  # sorted runs of (class hashes, sizes, occurrences, canonical forms or None); a class can be in several runs
+
+	def add(self, rows):
+		"""
+		Adds the solutions given as rows of a uint8 array (one byte per site). Returns the number of solutions that were new.
+		"""
+		import numpy as np
+
+		solutions = hash_rows(rows, self.keys)
+		classes = hash_rows(rows[:, self.permutations[0]], self.keys)
+		for permutation in self.permutations[1:]:
+			classes = np.minimum(classes, hash_rows(rows[:, permutation], self.keys))
+		self.read = self.read + len(rows)
+
+		# solutions which are neither in the index nor earlier in the batch
+		unique, first_ids = np.unique(solutions, return_index=True)
+		known = np.zeros(len(unique), dtype=bool)
+		for run in self.solution_runs:
+			positions = np.minimum(np.searchsorted(run, unique), len(run) - 1)
+			known = known | (run[positions] == unique)
+		new = first_ids[~known]
+		if len(new):
+			self.solution_runs.append(unique[~known])
+		while len(self.solution_runs) > 1 and 2 * len(self.solution_runs[-1]) >= len(self.solution_runs[-2]):
+			last = self.solution_runs.pop()
+			self.solution_runs[-1] = np.sort(np.concatenate((self.solution_runs[-1], last)), kind='stable')  # merges the two runs
+
+		# the classes of the batch: sizes count the new solutions, occurrences all solutions
+		batch_classes, first, inverse = np.unique(classes, return_index=True, return_inverse=True)
+		inverse = inverse.reshape(-1)
+		self.class_runs.append((batch_classes, np.bincount(inverse[new], minlength=len(batch_classes)),
+		                        np.bincount(inverse, minlength=len(batch_classes)),
+		                        self.canonical_forms(rows[first]) if self.with_representatives else None))
+		while len(self.class_runs) > 1 and 2 * len(self.class_runs[-1][0]) >= len(self.class_runs[-2][0]):
+			last = self.class_runs.pop()
+			self.class_runs[-1] = merge_classes(self.class_runs[-1], last)
+		return len(new)
+
+	def merge(self):
+		"""
+		Merges all runs into one.
+		"""
+		import numpy as np
+
+		if len(self.solution_runs) > 1:
+			self.solution_runs = [np.sort(np.concatenate(self.solution_runs))]
+		while len(self.class_runs) > 1:
+			last = self.class_runs.pop()
+			self.class_runs[-1] = merge_classes(self.class_runs[-1], last)
+
+	def _class_array(self, i):
+		import numpy as np
+
+		self.merge()
+		if self.class_runs:
+			return self.class_runs[0][i]
+		return np.zeros((0, self.n_sites), dtype=np.uint8) if i == 3 else np.zeros(0, dtype=np.uint64 if i == 0 else np.int64)
+
+	@property
+	def solutions(self):
+		"""
+		Sorted hashes of the distinct solutions.
+		"""
+		import numpy as np
+
+		self.merge()
+		return self.solution_runs[0] if self.solution_runs else np.zeros(0, dtype=np.uint64)
+
+	@property
+	def classes(self):
+		"""
+		Sorted hashes of the canonical forms.
+		"""
+		return self._class_array(0)
+
+	@property
+	def sizes(self):
+		"""
+		Number of distinct solutions per class.
+		"""
+		return self._class_array(1)
+
+	@property
+	def occurrences(self):
+		"""
+		Number of solutions added per class.
+		"""
+		return self._class_array(2)
+
+	@property
+	def representatives(self):
+		"""
+		Canonical form per class (None if the index was created without them).
+		"""
+		return self._class_array(3) if self.with_representatives else None
+
+	def canonical_forms(self, rows):
+		"""
+		Returns the image of every row whose hash is the smallest one.
+		"""
+		import numpy as np
+
+		images = np.stack([rows[:, permutation] for permutation in self.permutations])
+		hashes = np.stack([hash_rows(image, self.keys) for image in images])
+		return images[np.argmin(hashes, axis=0), np.arange(len(rows))]
+
+
+def merge_classes(run, other):
+	"""
+	Merges two sorted runs of (class hashes, sizes, occurrences, canonical forms or None) into one, adding up the counts of classes
+	that are in both.
+	"""
+	import numpy as np
+
+	merged = np.concatenate((run[0], other[0]))
+	order = np.argsort(merged, kind='stable')  # finds the two sorted runs and merges them
+	merged = merged[order]
+	starts = np.flatnonzero(np.concatenate(([True], merged[1:] != merged[:-1])))
+	sizes = np.add.reduceat(np.concatenate((run[1], other[1]))[order], starts)
+	occurrences = np.add.reduceat(np.concatenate((run[2], other[2]))[order], starts)
+	representatives = None
+	if run[3] is not None:
+		representatives = np.concatenate((run[3], other[3]))[order][starts]
+	return merged[starts], sizes, occurrences, representatives
+
+
+def batches(solutions, n_sites):
+	"""
+	Groups the given solutions (toStringLightweight strings) into uint8 arrays of at most BATCH_SIZE rows.
+	"""
+	import numpy as np
+
+	batch = []
+	for solution in solutions:
+		if len(solution) != n_sites:
+			raise ValueError('Solution with %d instead of %d sites: %s' % (len(solution), n_sites, solution))
+		batch.append(solution)
+		if len(batch) == BATCH_SIZE:
+			yield np.frombuffer(''.join(batch).encode('ascii'), dtype=np.uint8).reshape(-1, n_sites)
+			batch = []
+	if batch:
+		yield np.frombuffer(''.join(batch).encode('ascii'), dtype=np.uint8).reshape(-1, n_sites)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.dedup', description='Merge solution files, drop duplicates and count the solutions per class of symmetric copies.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('files', nargs='+', help='solution files (- for stdin), optionally compressed with gzip or zstd')
+	parser.add_argument('--format', choices=FORMATS, default='text', help='format of the solution files (default: text)')
+	parser.add_argument('--summary', action='store_true', help='only report the totals and the distribution of class sizes')
+	parser.add_argument('--cache-dir', help='load (or save) the placement table from (to) this directory')
+	args = parser.parse_args(argv)
+
+	start_time = time.time()
+	table = PlacementTable.for_puzzle(args.puzzle, args.cache_dir)
+	permutations = [permutation for permutation, images in placement_automorphisms(table, puzzles.load(args.puzzle).lattice)]
+	index = SolutionIndex(permutations, table.n_sites, not args.summary)
+	for path in args.files:
+		read = index.read
+		new = 0
+		for rows in batches(read_solutions(path, table, args.format), table.n_sites):
+			new = new + index.add(rows)
+		sys.stderr.write('%s: %d solutions, %d new\n' % (path, index.read - read, new))
+
+	if not args.summary:
+		for representative, size, occurrences in zip(index.representatives, index.sizes.tolist(), index.occurrences.tolist()):
+			print('%s %d %d' % (representative.tobytes().decode('ascii'), size, occurrences))
+	sizes = {}
+	for size in index.sizes.tolist():
+		sizes[size] = sizes.get(size, 0) + 1
+	for size in sorted(sizes):
+		sys.stderr.write('classes with %d distinct solutions: %d\n' % (size, sizes[size]))
+	sys.stderr.write('computing time: %.2f seconds\n' % (time.time() - start_time))
+	sys.stderr.write('board symmetries: %d\n' % len(permutations))
+	sys.stderr.write('number of solutions read: %d\n' % index.read)
+	sys.stderr.write('number of distinct solutions: %d\n' % len(index.solutions))
+	sys.stderr.write('number of classes: %d\n' % len(index.classes))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,62 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Named directions (x,y,z) which are used for describing configurations of pieces.
+"""
+
+# ----- square lattices (flat boards and the layers of pyramids) -----
+up = (0,-1,0)
+right = (1,0,0)
+down = (0,1,0)
+left = (-1,0,0)
+
+# ----- links between the layers of pyramids -----
+une = (1,-1,-1)  # up-north-east
+use = (1,1,-1)  # up-south-east
+unw = (-1,-1,-1)  # up-north-west
+usw = (-1,1,-1)  # up-south-west
+dne = (1,-1,1)  # down-north-east
+dse = (1,1,1)  # down-south-east
+dnw = (-1,-1,1)  # down-north-west
+dsw = (-1,1,1)  # down-south-west
+
+# ----- diagonal lattices (crazy cone) -----
+ne = (1,-1,0)  # north-east
+se = (1,1,0)  # south-east
+sw = (-1,1,0)  # south-west
+nw = (-1,-1,0)  # north-west
+
+
+# ----- direction ids -----
+# The C++ solver looks up the neighbor of a site in a table with one entry per direction (LatticeSite::neighborsByDirection);
+# the generated code passes the ids of the directions along with the vectors.
+
+NUMBER_OF_DIRECTIONS = 27  # same as in vector3d.h
+
+
+def direction_id(direction):
+	"""
+	Returns the id of a direction with components in {-1,0,1}, i.e. (dx+1)*9 + (dy+1)*3 + (dz+1).
+	"""
+	if tuple(direction) == (0,0,0) or any(component not in (-1,0,1) for component in direction):
+		raise ValueError('Direction without id: %s' % (tuple(direction),))
+	return (direction[0]+1)*9 + (direction[1]+1)*3 + (direction[2]+1)
@@ -0,0 +1,222 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Solves a puzzle as an exact cover problem with Knuth's Algorithm X using Dancing Links:
+
+    python -m puzzle3d.dlx <puzzle>
+
+Every lattice site is a column that must be covered exactly once. Every piece is a column as well which is covered at most once
+(exactly once if the pieces fill the lattice completely). Each valid placement of a piece is a row that covers the piece's column
+and the sites of the placement. The search always continues with the column that has the fewest remaining rows.
+
+Solutions are printed in the same format as Lattice::toStringLightweight (one symbol per site, sites in scan order).
+"""
+
+import argparse
+import sys
+import time
+
+from . import puzzles
+from .placements import PlacementTable
+
+
+class DancingLinks:
+	"""
+	Sparse 0/1 matrix as a toroidal doubly linked list (stored in flat lists of node indices).
+	Node 0 is the root, nodes 1..n_columns are the column headers. Only the primary columns are linked to the root,
+	secondary columns may be covered at most once.
+	"""
+	def __init__(self, n_primary, n_secondary, rows):
+		n_columns = n_primary + n_secondary
+		self.left = list(range(-1, n_columns))
+		self.right = list(range(1, n_columns+2))
+		self.left[0] = n_primary
+		self.right[n_primary] = 0
+		for column in range(n_primary+1, n_columns+1):  # secondary columns are not part of the header list
+			self.left[column] = column
+			self.right[column] = column
+		self.up = list(range(n_columns+1))
+		self.down = list(range(n_columns+1))
+		self.column = list(range(n_columns+1))
+		self.row = [-1] * (n_columns+1)
+		self.size = [0] * (n_columns+1)
+
+		for row_id, columns in enumerate(rows):
+			first = None
+			for column in columns:
+				node = len(self.column)
+				header = column + 1
+				self.column.append(header)
+				self.row.append(row_id)
+				self.up.append(self.up[header])
+				self.down.append(header)
+				self.down[self.up[header]] = node
+				self.up[header] = node
+				self.size[header] = self.size[header] + 1
+				if first is None:
+					first = node
+					self.left.append(node)
+					self.right.append(node)
+				else:
+					self.left.append(self.left[first])
+					self.right.append(first)
+					self.right[self.left[first]] = node
+					self.left[first] = node
+		self.steps = 0  # number of rows chosen by solve, i.e. placements made
+
+	def cover(self, header):
+		left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+		right[left[header]] = right[header]
+		left[right[header]] = left[header]
+		i = down[header]
+		while i != header:
+			j = right[i]
+			while j != i:
+				down[up[j]] = down[j]
+				up[down[j]] = up[j]
+				size[column[j]] = size[column[j]] - 1
+				j = right[j]
+			i = down[i]
+
+	def uncover(self, header):
+		left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+		i = up[header]
+		while i != header:
+			j = left[i]
+			while j != i:
+				size[column[j]] = size[column[j]] + 1
+				down[up[j]] = j
+				up[down[j]] = j
+				j = left[j]
+			i = up[i]
+		right[left[header]] = header
+		left[right[header]] = header
+
+	def choose_column(self):
+		"""
+		Returns the primary column with the fewest rows.
+		"""
+		right, size = self.right, self.size
+		best = right[0]
+		header = right[best]
+		while header != 0:
+			if size[header] < size[best]:
+				best = header
+			header = right[header]
+		return best
+
+	def solve(self, max_steps=None):
+		"""
+		Yields every exact cover as a list of row indices until the search is finished or `max_steps` rows have been chosen.
+		"""
+		solution = []
+
+		def search():
+			if self.right[0] == 0:
+				yield list(solution)
+				return
+			header = self.choose_column()
+			if self.size[header] == 0:
+				return
+			self.cover(header)
+			i = self.down[header]
+			while i != header:
+				if self.steps == max_steps:
+					break
+				self.steps = self.steps + 1
+				solution.append(self.row[i])
+				j = self.right[i]
+				while j != i:
+					self.cover(self.column[j])
+					j = self.right[j]
+				for result in search():
+					yield result
+				j = self.left[i]
+				while j != i:
+					self.uncover(self.column[j])
+					j = self.left[j]
+				solution.pop()
+				i = self.down[i]
+			self.uncover(header)
+
+		return search()
+
+
+def solve(table, max_steps=None, statistics=None):
+	"""
+	Yields all solutions of a placement table in the format of Lattice::toStringLightweight, or those found within the first
+	`max_steps` placements. If `statistics` is given (a dict), the number of placements made is stored in it as 'steps'.
+	"""
+	n_sites = table.n_sites
+	rows = []
+	for piece_id, mask in zip(table.pieces, table.masks):
+		rows.append([site_id for site_id in range(n_sites) if mask >> site_id & 1] + [n_sites + piece_id])
+
+	if sum(table.sizes) == n_sites:
+		matrix = DancingLinks(n_sites + table.n_pieces, 0, rows)  # all pieces are used
+	else:
+		matrix = DancingLinks(n_sites, table.n_pieces, rows)
+
+	try:
+		for solution in matrix.solve(max_steps):
+			yield to_string(table, solution)
+	finally:
+		if statistics is not None:
+			statistics['steps'] = matrix.steps
+
+
+def to_string(table, placements):
+	"""
+	Returns the lattice with the given placements in the format of Lattice::toStringLightweight.
+	"""
+	symbols = ['0'] * table.n_sites
+	for placement in placements:
+		mask = table.masks[placement]
+		symbol = table.symbols[table.pieces[placement]]
+		for site_id in range(table.n_sites):
+			if mask >> site_id & 1:
+				symbols[site_id] = symbol
+	return ''.join(symbols)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.dlx', description='Find all solutions of a puzzle with Dancing Links.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--cache-dir', help='load (or save) the placement table from (to) this directory')
+	parser.add_argument('--max-steps', type=int, metavar='N', help='stop after N placements (the counts cover only this part of the search)')
+	args = parser.parse_args(argv)
+
+	start_time = time.time()
+	table = PlacementTable.for_puzzle(args.puzzle, args.cache_dir)
+	n_solutions = 0
+	statistics = {}
+	for solution in solve(table, args.max_steps, statistics):
+		n_solutions = n_solutions + 1
+		print(solution)
+
+	sys.stderr.write('computing time: %.2f seconds\n' % (time.time() - start_time))
+	sys.stderr.write('number of placements: %d\n' % statistics['steps'])
+	sys.stderr.write('number of solutions found: %d\n' % n_solutions)
+
+
+if __name__ == '__main__':
+	main()
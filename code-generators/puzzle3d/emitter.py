@@ -0,0 +1,86 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Collects generated code chunk by chunk instead of concatenating strings (which is quadratic in the size of the output).
+"""
+
+PLACEHOLDER = '// fill generated code in here'  # marks the position of the generated code in create_lattice.h and create_pieces.h
+
+
+class CodeEmitter:
+	"""
+	Either keeps the chunks in a list which is joined once by `getvalue` or writes them straight to the (buffered) file object `fp`.
+	If `indent` is given, it is prepended to every non-empty line.
+	"""
+	def __init__(self, fp=None, indent=''):
+		self.fp = fp
+		self.indent = indent
+		self.parts = []
+		self.at_line_start = True
+
+	def write(self, chunk):
+		if self.indent:
+			chunk = self._indented(chunk)
+		if self.fp is None:
+			self.parts.append(chunk)
+		else:
+			self.fp.write(chunk)
+
+	def _indented(self, chunk):
+		lines = chunk.split('\n')
+		for i, line in enumerate(lines):
+			if line and (i > 0 or self.at_line_start):
+				lines[i] = self.indent + line
+		if chunk:
+			self.at_line_start = chunk.endswith('\n')
+		return '\n'.join(lines)
+
+	def getvalue(self):
+		"""
+		Returns the code emitted so far (only available if the code is kept in memory).
+		"""
+		if self.fp is not None:
+			raise ValueError('Code has been written to a file and is not kept in memory')
+		code = ''.join(self.parts)
+		self.parts = [code]
+		return code
+
+
+def write_header(template_path, output_path, write_code):
+	"""
+	Writes the header `template_path` to `output_path` where the placeholder line is replaced by the code which `write_code(emitter)` emits.
+	The template is read entirely before `output_path` is opened, so both may be the same file.
+	The generated code is streamed to the file and not kept in memory.
+	"""
+	with open(template_path) as fp:
+		template = fp.read()
+
+	position = template.find(PLACEHOLDER)
+	if position < 0:
+		raise ValueError('%s does not contain the placeholder "%s"' % (template_path, PLACEHOLDER))
+	line_start = template.rfind('\n', 0, position) + 1
+	indent = template[line_start:position]
+
+	with open(output_path, 'w') as fp:
+		fp.write(template[:line_start])
+		write_code(CodeEmitter(fp, indent=indent))
+		fp.write(template[position+len(PLACEHOLDER):])
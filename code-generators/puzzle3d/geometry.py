@@ -0,0 +1,152 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Positions of the junctions of a configuration.
+
+Directions within a layer are given in units of the lattice spacing while directions between layers (pyramids) use x and y components of +-1
+to indicate the half step towards the sites of the adjacent layer. In order to compare positions that are reached via different paths,
+directions are therefore converted to displacements in units of half a lattice spacing (x and y) and in units of the layer spacing (z).
+"""
+
+
+def displacement(direction):
+	if direction[2] == 0:  # link within a layer
+		return (2*direction[0], 2*direction[1], 0)
+	return (direction[0], direction[1], direction[2])  # link to an adjacent layer
+
+
+def add(position, direction):
+	d = displacement(direction)
+	return (position[0]+d[0], position[1]+d[1], position[2]+d[2])
+
+
+def scan_key(position):
+	"""
+	Sort key which orders positions in the same way the solver scans the lattice (layers, then rows, then sites).
+	"""
+	return (position[2], position[1], position[0])
+
+
+def walk(links):
+	"""
+	Yields (i, j, direction) for every junction j but the seed, where i is the junction that j follows. Junctions are numbered in the order
+	in which they are reached (depth-first, branches in the given order), so i < j. The walk is iterative and doesn't modify the links,
+	so it takes linear time for configurations of any size.
+	"""
+	stack = [[iter(links), 0]]  # per branch that is being followed: its remaining elements and the junction reached last
+	n_junctions = 1
+	while stack:
+		frame = stack[-1]
+		elem = next(frame[0], None)
+		if elem is None:  # end of branch
+			stack.pop()
+		elif isinstance(elem, list):  # more than one branch; the first one is followed first
+			stack.extend([iter(branch), frame[1]] for branch in reversed(elem))
+		else:
+			yield frame[1], n_junctions, elem
+			frame[1] = n_junctions
+			n_junctions = n_junctions + 1
+
+
+def tree(links):
+	"""
+	Returns the junctions of a configuration as (positions, edges) where edges[i] holds a (j, direction) pair for every junction j following junction i.
+	Junction 0 is the seed and is located at (0,0,0); junctions are numbered as by `walk`.
+	"""
+	positions = [(0, 0, 0)]
+	edges = [[]]
+	for prev_id, next_id, direction in walk(links):
+		positions.append(add(positions[prev_id], direction))
+		edges.append([])
+		edges[prev_id].append((next_id, direction))
+	return positions, edges
+
+
+def links_from_tree(edges, junc_id=0):
+	"""
+	Inverse of `tree`: returns the links of the (sub-)configuration that starts at junction `junc_id`.
+	"""
+	links = []
+	stack = [(junc_id, links)]  # junctions whose branches are still to be added, along with the list the (first) branch is added to
+	while stack:
+		junc_id, target = stack.pop()
+		if len(edges[junc_id]) == 1:  # the branch continues the current list
+			next_id, direction = edges[junc_id][0]
+			target.append(direction)
+			stack.append((next_id, target))
+		elif len(edges[junc_id]) > 1:
+			branches = [[direction] for next_id, direction in edges[junc_id]]
+			target.append(branches)
+			stack.extend((next_id, branch) for (next_id, direction), branch in zip(edges[junc_id], branches))
+	return links
+
+
+def reroot(links, junc_id):
+	"""
+	Returns the links of the same configuration but with junction `junc_id` as seed. Edges on the way from the new to the old seed are reversed.
+	"""
+	if junc_id == 0:
+		return links
+	positions, edges = tree(links)
+	neighbors = [[] for position in positions]
+	for prev_id, branches in enumerate(edges):
+		for next_id, direction in branches:
+			neighbors[prev_id].append((next_id, direction))
+			neighbors[next_id].append((prev_id, (-direction[0], -direction[1], -direction[2])))
+
+	new_edges = [[] for position in positions]
+	visited = set([junc_id])
+	stack = [junc_id]
+	while stack:
+		prev_id = stack.pop()
+		for next_id, direction in neighbors[prev_id]:
+			if next_id not in visited:
+				visited.add(next_id)
+				new_edges[prev_id].append((next_id, direction))
+				stack.append(next_id)
+	return links_from_tree(new_edges, junc_id)
+
+
+def anchored(links):
+	"""
+	Returns the links of the same configuration with the first cell in scan order as seed.
+	"""
+	positions = cells(links)
+	first = min(range(len(positions)), key=lambda junc_id: scan_key(positions[junc_id]))
+	return reroot(links, first)
+
+
+def cells(links):
+	"""
+	Returns the positions (relative to the seed) of all junctions of a configuration.
+	"""
+	return tree(links)[0]
+
+
+def canonical_form(links):
+	"""
+	Returns the cells of a configuration sorted in scan order and translated such that the first one is located at (0,0,0).
+	Two configurations with the same canonical form cover the same sites when their first cells are placed on the same site.
+	"""
+	positions = sorted(cells(links), key=scan_key)
+	first = positions[0]
+	return tuple((p[0]-first[0], p[1]-first[1], p[2]-first[2]) for p in positions)
@@ -0,0 +1,246 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+The lattice consists of layers, each layer consists of rows and each row consists of sites.
+A site is identified by its indices (x,y,z) where z numbers the layer, y the row within the layer and x the site within the row.
+
+Lattices are built from a shape (which sites exist, see SHAPES) and a neighbor rule (which sites are linked, see NEIGHBOR_RULES)
+with vectorised index arithmetic (requires NumPy), so boards with many thousands of sites are generated quickly:
+
+    lattice = build_lattice('prism', 'cubic', x_extent=30, y_extent=30, z_extent=30)
+"""
+
+
+def reverse_link(link):
+	return -link[0], -link[1], -link[2]
+
+
+class Lattice:
+	def __init__(self):
+		self.layers = []  # each layer is a list of rows, each row is a list of sites (x,y,z)
+		self._links = []  # stores (site1, site2, direction) where direction points from site1 to site2 (None if not created yet)
+		self._link_array = None  # the same links as array (see link_array), if created already
+
+	def add_layer(self):
+		self.layers.append([])
+
+	def add_row(self):
+		self.layers[-1].append([])
+
+	def add_site(self, x, y, z):
+		self.layers[-1][-1].append((x, y, z))
+
+	def add_link(self, site1, site2, direction):
+		"""
+		Adds site2 to the nearest neighbors of site1 (along with direction) and vice versa.
+		"""
+		self.links.append((site1, site2, direction))
+		self.links.append((site2, site1, reverse_link(direction)))
+		self._link_array = None
+
+	def set_link_array(self, links):
+		"""
+		Replaces all links by the given array (see link_array); the list of links is only created when it is used.
+		"""
+		self._links = None
+		self._link_array = links
+
+	@property
+	def links(self):
+		if self._links is None:
+			sites = self.sites
+			self._links = [(sites[src], sites[dst], (dx, dy, dz)) for src, dst, dx, dy, dz in self._link_array.tolist()]
+		return self._links
+
+	def link_array(self):
+		"""
+		Returns all links as NumPy array with one row (src, dst, dx, dy, dz) per link, where src and dst are site indices
+		in scan order and (dx, dy, dz) is the direction from src to dst.
+		"""
+		import numpy as np
+
+		if self._link_array is None:
+			site_ids = dict((site, i) for i, site in enumerate(self.sites))
+			rows = [(site_ids[site1], site_ids[site2]) + tuple(direction) for site1, site2, direction in self._links]
+			self._link_array = np.array(rows, dtype=np.int64).reshape(-1, 5)
+		return self._link_array
+
+	@property
+	def sites(self):
+		"""
+		All sites in the order in which the solver scans the lattice (layers, then rows, then sites).
+		"""
+		return [site for layer in self.layers for row in layer for site in row]
+
+	def neighbors(self):
+		"""
+		Returns a dict which maps each site to a dict {direction: neighboring site}.
+		"""
+		neighbors = dict((site, {}) for site in self.sites)
+		for site1, site2, direction in self.links:
+			neighbors[site1][tuple(direction)] = site2
+		return neighbors
+
+
+SHAPES = {  # shape -> extents that must be given
+	'rectangle': ('x_extent', 'y_extent'),  # a single layer of y_extent rows with x_extent sites each
+	'prism': ('x_extent', 'y_extent', 'z_extent'),  # z_extent rectangular layers stacked on top of each other
+	'triangle': ('y_extent',),  # a single layer whose row y holds (y_extent - y) sites
+	'pyramid': ('z_extent',),  # layer z holds (z+1)x(z+1) sites
+}
+
+# neighbor rule -> list of (offset, direction): each site (x,y,z) is linked to the site at (x,y,z) + offset (if there is one)
+# via direction, and vice versa via the reversed direction. Links are added per site (in scan order) in the order of this list.
+NEIGHBOR_RULES = {
+	'square': [((0, 1, 0), (0, 1, 0)), ((1, 0, 0), (1, 0, 0))],
+	'cubic': [((0, 1, 0), (0, 1, 0)), ((1, 0, 0), (1, 0, 0)), ((0, 0, 1), (0, 0, 1))],
+	'diagonal': [((-1, 1, 0), (-1, 1, 0)), ((0, 1, 0), (1, 1, 0))],  # links between subsequent rows of a triangle only
+	'pyramid': [((0, 1, 0), (0, 1, 0)), ((1, 0, 0), (1, 0, 0)),
+	            ((0, 0, 1), (-1, -1, 1)), ((1, 0, 1), (1, -1, 1)), ((0, 1, 1), (-1, 1, 1)), ((1, 1, 1), (1, 1, 1))],
+}
+
+
+def site_indices(shape, **extents):
+	"""
+	Returns the x, y and z indices (NumPy arrays) of all sites of the given shape (see SHAPES) in scan order.
+	"""
+	import numpy as np
+
+	if shape not in SHAPES:
+		raise ValueError('Unknown shape: %s (available: %s)' % (shape, ', '.join(sorted(SHAPES))))
+	if sorted(extents) != sorted(SHAPES[shape]):
+		raise ValueError('A %s requires the extents %s' % (shape, ', '.join(SHAPES[shape])))
+
+	x_extent = extents.get('x_extent', extents.get('y_extent', extents.get('z_extent')))  # bounding box of the shape
+	y_extent = extents.get('y_extent', extents.get('z_extent'))
+	z_extent = extents.get('z_extent', 1)
+	z, y, x = np.indices((z_extent, y_extent, x_extent)).reshape(3, -1)  # row-major, i.e. in scan order
+	if shape == 'triangle':
+		inside = x < y_extent - y
+	elif shape == 'pyramid':
+		inside = (x <= z) & (y <= z)
+	else:
+		return x, y, z
+	return x[inside], y[inside], z[inside]
+
+
+def neighbor_links(x, y, z, rule):
+	"""
+	Returns the links between the sites with the given indices (NumPy arrays, in scan order) according to `rule` (see NEIGHBOR_RULES)
+	as array of rows (src, dst, dx, dy, dz) (see Lattice.link_array). Like with Lattice.add_link every link is followed by its reverse.
+	"""
+	import numpy as np
+
+	if rule not in NEIGHBOR_RULES:
+		raise ValueError('Unknown neighbor rule: %s (available: %s)' % (rule, ', '.join(sorted(NEIGHBOR_RULES))))
+	n_sites = len(x)
+
+	# site_ids[z,y,x] is the index of site (x,y,z) in scan order, -1 if there is no such site (the array has one more entry per axis
+	# than the bounding box so that offsets of +1 or -1 never leave it)
+	site_ids = np.full((z.max()+2, y.max()+2, x.max()+2), -1, dtype=np.int64)
+	site_ids[z, y, x] = np.arange(n_sites)
+
+	offsets = np.array([offset for offset, direction in NEIGHBOR_RULES[rule]])
+	directions = np.array([direction for offset, direction in NEIGHBOR_RULES[rule]])
+	x2 = x[:, np.newaxis] + offsets[:, 0]  # one column per rule
+	y2 = y[:, np.newaxis] + offsets[:, 1]
+	z2 = z[:, np.newaxis] + offsets[:, 2]
+	targets = site_ids[z2, y2, x2]  # negative indices wrap around to the extra (empty) entry
+	src, rule_ids = np.nonzero(targets >= 0)  # row-major, i.e. per site in scan order, then per rule
+	dst = targets[src, rule_ids]
+	directions = directions[rule_ids]
+
+	forward = np.column_stack((src, dst, directions))
+	reverse = np.column_stack((dst, src, -directions))
+	return np.stack((forward, reverse), axis=1).reshape(-1, 5)
+
+
+def build_lattice(shape, rule, **extents):
+	"""
+	Returns the lattice of the given shape (see SHAPES) whose sites are linked according to `rule` (see NEIGHBOR_RULES).
+	"""
+	import numpy as np
+
+	x, y, z = site_indices(shape, **extents)
+	n_sites = len(x)
+	links = neighbor_links(x, y, z, rule)
+
+	lattice = Lattice()
+	sites = list(zip(x.tolist(), y.tolist(), z.tolist()))
+	starts = (np.flatnonzero((np.diff(y) != 0) | (np.diff(z) != 0)) + 1).tolist()  # first site of every row but the first one
+	for start, end in zip([0] + starts, starts + [n_sites]):
+		if start == 0 or sites[start][2] != sites[start-1][2]:
+			lattice.add_layer()
+		lattice.add_row()
+		lattice.layers[-1][-1].extend(sites[start:end])
+	lattice.set_link_array(links)
+	return lattice
+
+
+def rectangular_lattice(x_extent, y_extent):
+	"""
+	Lattice orientation is horizontally as follows (where '?' marks a lattice site):
+
+	    x x x
+	    = = = ...
+	    0 1 2
+	y=0 ? ? ?
+	y=1 ? ? ?
+	y=2 ? ? ?
+	...
+
+	"""
+	return build_lattice('rectangle', 'square', x_extent=x_extent, y_extent=y_extent)
+
+
+def cone_lattice(y_extent):
+	"""
+	Lattice orientation is horizontally as follows (where '?' marks a lattice site), row y holds (y_extent - y) sites:
+
+	    x x x
+	    = = = ...
+	    0 1 2
+	y=0 ? ? ?
+	y=1 ? ? ?
+	y=2 ? ? ?
+	...
+
+	Neighboring sites are located in subsequent rows only, i.e. site (x,y) is linked to (x-1,y+1) via (-1,1,0) and to (x,y+1) via (1,1,0).
+	"""
+	return build_lattice('triangle', 'diagonal', y_extent=y_extent)
+
+
+def pyramid_lattice(z_extent):
+	"""
+	Lattice orientation is vertically from top (0) to bottom (z_extent-1) and horizontally as follows (where '?' marks a lattice site), layer z holds (z+1)x(z+1) sites:
+
+	    x x x
+	    = = = ...
+	    0 1 2
+	y=0 ? ? ?
+	y=1 ? ? ?
+	y=2 ? ? ?
+	...
+
+	Site (x,y,z) is linked to the four sites (x,y,z+1), (x+1,y,z+1), (x,y+1,z+1), (x+1,y+1,z+1) of the layer below, where the link's x (y) component is -1 for x (y) and +1 for x+1 (y+1).
+	"""
+	return build_lattice('pyramid', 'pyramid', z_extent=z_extent)
@@ -0,0 +1,124 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Counts the solutions of a puzzle with memoisation instead of enumerating them:
+
+    python -m puzzle3d.memo <puzzle> [--cache-size N]
+
+The number of solutions per top-level branch is printed like with `python -m puzzle3d.bitboard <puzzle> --count`.
+
+The bitboard solver fills the sites in scan order, i.e. layer by layer and row by row. When it reaches a free site, all sites
+before it are occupied, so the number of ways to complete the board depends only on the occupied sites from there on (the
+frontier, which only reaches as far as the placed pieces stick out) and on the set of pieces that are still left. Different
+partial solutions often end in the same state, e.g. when the same pieces fill the lower layers in different ways, and its
+count is computed only once (dynamic programming over the states, like a transfer matrix between layers).
+
+The counts are kept in a dict in least recently used order. Once it holds N states, the least recently used one is dropped,
+which bounds the memory at the cost of computing some states again.
+"""
+
+import argparse
+import collections
+import sys
+import time
+
+from . import puzzles
+from .bitboard import Solver, lowest_bit, write_branches
+from .placements import PlacementTable
+
+
+class MemoCounter:
+	"""
+	Counts the completions of a board state (board, used) where `board` holds the occupied sites and `used` one bit per used piece.
+	"""
+	def __init__(self, solver, cache_size=1 << 20):
+		self.solver = solver
+		self.cache_size = cache_size
+		self.cache = collections.OrderedDict()  # (board, used) -> number of completions, least recently used first
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def count(self, board=0, used=0):
+		"""
+		Returns the number of ways to fill the free sites of `board` with pieces that are not in `used`.
+		"""
+		full = self.solver.full
+		if board == full:
+			return 1
+		cache = self.cache
+		key = (board, used)
+		if key in cache:
+			self.hits = self.hits + 1
+			cache.move_to_end(key)
+			return cache[key]
+		self.misses = self.misses + 1
+
+		total = 0
+		for mask, piece, placement in self.solver.candidates[lowest_bit(~board & full)]:
+			if not (board & mask or used & piece):
+				total = total + self.count(board | mask, used | piece)
+
+		cache[key] = total
+		if len(cache) > self.cache_size:
+			cache.popitem(last=False)
+			self.evictions = self.evictions + 1
+		return total
+
+	def count_branches(self, board=0, used=0):
+		"""
+		Returns the number of completions per placement on the first free site as dict {placement: solutions}
+		(like bitboard.Solver.count for the empty board). Branches without solutions are left out.
+		"""
+		full = self.solver.full
+		branches = {}
+		for mask, piece, placement in self.solver.candidates[lowest_bit(~board & full)]:
+			if not (board & mask or used & piece):
+				n_solutions = self.count(board | mask, used | piece)
+				if n_solutions:
+					branches[placement] = n_solutions
+		return branches
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.memo', description='Count the solutions of a puzzle with memoisation of board states.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--cache-size', type=int, default=1 << 20, help='maximum number of memoised states (default: 1048576)')
+	parser.add_argument('--cache-dir', help='load (or save) the placement table from (to) this directory')
+	args = parser.parse_args(argv)
+
+	start_time = time.time()
+	table = PlacementTable.for_puzzle(args.puzzle, args.cache_dir)
+	solver = Solver(table)
+	counter = MemoCounter(solver, args.cache_size)
+	branches = counter.count_branches()
+	write_branches(solver, branches)
+	n_solutions = sum(branches.values())
+
+	sys.stderr.write('computing time: %.2f seconds\n' % (time.time() - start_time))
+	sys.stderr.write('memoised states: %d (%d hits, %d misses, %d evicted)\n'
+	                 % (len(counter.cache), counter.hits, counter.misses, counter.evictions))
+	sys.stderr.write('number of solutions found: %d\n' % n_solutions)
+
+
+if __name__ == '__main__':
+	main()
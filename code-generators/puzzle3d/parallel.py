@@ -0,0 +1,199 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Solves a puzzle with a pool of worker processes:
+
+    python -m puzzle3d.parallel <puzzle> [--processes N] [--depth K]
+
+The search tree of the bitboard solver is expanded up to depth K (i.e. all combinations of the first K placements) and each of
+the resulting subtrees is solved by one of the workers. The subtrees are disjoint, so no solution is found twice; workers send their
+solutions in chunks as they find them, and they are written as they arrive. Progress is reported per worker on stderr.
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+from . import puzzles, sink
+from .bitboard import Solver, lowest_bit, write_branches
+from .placements import PlacementTable, cache_directory
+
+
+def expand(solver, depth, board=0, used=0, placements=()):
+	"""
+	Yields the nodes of the search tree at the given depth as (board, used, placements).
+	Nodes with a full board above that depth are yielded as well (they are solutions).
+	"""
+	if depth == 0 or board == solver.full:
+		yield board, used, tuple(placements)
+		return
+	for mask, piece, placement in solver.candidates[lowest_bit(~board & solver.full)]:
+		if not (board & mask or used & piece):
+			for node in expand(solver, depth-1, board | mask, used | piece, placements + (placement,)):
+				yield node
+
+
+CHUNK_SIZE = 1000  # number of solutions that a worker sends at once
+
+_solver = None  # solver of the worker process
+_results = None  # queue to the parent process (see _solve_subtree)
+
+
+def _init_worker(directory, results=None):
+	global _solver, _results
+	_solver = Solver(PlacementTable.load_mapped(directory))
+	_results = results
+
+
+def _solve_subtree(node):
+	"""
+	Solves one subtree in a worker process. Sends its solutions to the results queue as ('solutions', list of solutions), at most
+	CHUNK_SIZE at a time, and then ('finished', worker pid, solutions of the subtree, seconds).
+	If anything fails, ('error', pid, traceback) is sent instead.
+	"""
+	try:
+		start_time = time.time()
+		board, used, placements = node
+		chunk = []
+		n_solutions = 0
+		for solution in _solver.solve(placements):
+			chunk.append(solution)
+			n_solutions = n_solutions + 1
+			if len(chunk) == CHUNK_SIZE:
+				_results.put(('solutions', chunk))
+				chunk = []
+		if chunk:
+			_results.put(('solutions', chunk))
+		_results.put(('finished', os.getpid(), n_solutions, time.time() - start_time))
+	except Exception:
+		_results.put(('error', os.getpid(), traceback.format_exc()))
+
+
+def _count_subtree(node):
+	"""
+	Counts the solutions of one subtree in a worker process and returns (worker pid, {first placement: solutions}, seconds).
+	"""
+	start_time = time.time()
+	board, used, placements = node
+	branches = _solver.count(placements)
+	return os.getpid(), branches, time.time() - start_time
+
+
+def solve(table, directory, processes=None, depth=1, progress=None):
+	"""
+	Yields all solutions of the puzzle of `table` (each as a tuple of sorted placement indices). `directory` holds the same table
+	saved by PlacementTable.save_mapped, which the workers memory-map.
+	`progress`, if given, is called with (worker pid, finished subtrees, total subtrees, solutions of the subtree, seconds) after each subtree.
+	"""
+	nodes = list(expand(Solver(table), depth))
+	results = multiprocessing.Queue()
+	pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(directory, results))
+	try:
+		pool.map_async(_solve_subtree, nodes, chunksize=1)
+		finished = 0
+		while finished < len(nodes):
+			message = results.get()
+			if message[0] == 'solutions':
+				for solution in message[1]:
+					yield tuple(sorted(solution))
+			elif message[0] == 'error':
+				raise RuntimeError('worker %d failed:\n%s' % (message[1], message[2]))
+			else:
+				finished = finished + 1
+				if progress is not None:
+					progress(message[1], finished, len(nodes), message[2], message[3])
+	finally:
+		pool.terminate()
+		pool.join()
+
+
+def count(table, directory, processes=None, depth=1, progress=None):
+	"""
+	Returns the number of solutions per first placement as dict {first placement: solutions} (see bitboard.Search.run), without
+	building any solution. The arguments are the same as for solve.
+	"""
+	nodes = list(expand(Solver(table), depth))
+	branches = {}
+	pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(directory,))
+	try:
+		for i, (pid, subtree_branches, seconds) in enumerate(pool.imap_unordered(_count_subtree, nodes)):
+			if progress is not None:
+				progress(pid, i+1, len(nodes), sum(subtree_branches.values()), seconds)
+			for placement, n_solutions in subtree_branches.items():
+				branches[placement] = branches.get(placement, 0) + n_solutions
+	finally:
+		pool.terminate()
+		pool.join()
+	return branches
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.parallel', description='Find all solutions of a puzzle with a pool of worker processes.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: number of CPUs)')
+	parser.add_argument('--depth', type=int, default=1, help='number of placements after which the search tree is split (default: 1)')
+	parser.add_argument('--cache-dir', help='load (or save) the placement table from (to) this directory')
+	parser.add_argument('--count', action='store_true', help='only count the solutions (per first placement) instead of writing them')
+	sink.add_arguments(parser)
+	args = parser.parse_args(argv)
+
+	workers = {}  # pid -> [subtrees, solutions, seconds]
+
+	def progress(pid, finished, total, n_solutions, seconds):
+		stats = workers.setdefault(pid, [0, 0, 0.0])
+		stats[0] = stats[0] + 1
+		stats[1] = stats[1] + n_solutions
+		stats[2] = stats[2] + seconds
+		sys.stderr.write('[%d/%d] worker %d: %d solutions in %.2f seconds\n' % (finished, total, pid, n_solutions, seconds))
+
+	start_time = time.time()
+	temporary_dir = None
+	cache_dir = args.cache_dir
+	if cache_dir is None:
+		cache_dir = temporary_dir = tempfile.mkdtemp()
+	try:
+		table = PlacementTable.for_puzzle(args.puzzle, cache_dir)  # saved once, the workers memory-map it
+		directory = cache_directory(args.puzzle, cache_dir)
+		if args.count:
+			branches = count(table, directory, args.processes, args.depth, progress)
+			write_branches(Solver(table), branches)
+			n_solutions = sum(branches.values())
+		else:
+			with sink.open_sink(table, args) as output:
+				n_solutions = output.write_all(solve(table, directory, args.processes, args.depth, progress))
+	finally:
+		if temporary_dir is not None:
+			shutil.rmtree(temporary_dir)
+
+	for pid in sorted(workers):
+		sys.stderr.write('worker %d: %d subtrees, %d solutions, %.2f seconds\n' % ((pid,) + tuple(workers[pid])))
+	sys.stderr.write('computing time: %.2f seconds\n' % (time.time() - start_time))
+	sys.stderr.write('number of solutions found: %d\n' % n_solutions)
+
+
+if __name__ == '__main__':
+	main()
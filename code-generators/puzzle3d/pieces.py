@@ -0,0 +1,185 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+The direction to the next junction is indicated by (x,y,z).
+A branch (sequence of directions) is indicated by [ (), ... ].
+A fork (multiple branches going off the current junction) is indicated by enclosing all branches in additional square brackets, i.e. [[ (), ... ], [ (), ... ], ...].
+
+An example configuration:
+[ (1,0,0), [[ (1,0,0) ], [ (0,1,0) ]] ]
+where the outer square brackets indicate the main branch and the inner (2nd) square brackets indicate a off-branching, enclosing the new branches (3rd level of square brackets).
+The above configuration means:
+1) go towards (1,0,0)
+	1.1) go towards (1,0,0)
+	1.2) go towards (0,1,0)
+
+Another example:
+[ (1,0,0), [[ (1,0,0), [[ (0,0,1), (0,0,1) ], [ (0,1,0) ]] ], [ (0,1,0) ], [ (0,0,1) ]] ]
+which means:
+1) go towards (1,0,0)
+	1.1) go towards (1,0,0)
+		1.1.1) go towards (0,0,1)
+			1.1.1.1) go towards (0,0,1)
+		1.1.2) go towards (0,1,0)
+	1.2) go towards (0,1,0)
+	1.3) go towards (0,0,1)
+
+Elevated configurations (pyramids) start such that they are within the plane that is spanned by the vectors (1,1,1) (up-north-east) and (1,1,-1) (down-north-east).
+They are mirrored on the plane that is normal to (-1,1,-1) (up-south-west).
+"""
+
+from . import geometry
+from .transformations import rotate_clockwise_by_90_degrees, mirror_on_y_axis, mirror_on_plane, mirror_on_south_east_diagonal_axis
+
+
+def count_junctions(links):
+	"""
+	Returns the number of junctions (including the seed junction) of a configuration.
+	"""
+	return 1 + sum(1 for edge in geometry.walk(links))
+
+
+class Piece:
+	"""
+	Configurations that are equal up to translation are dropped (see geometry.canonical_form) and the remaining ones are anchored,
+	i.e. their seed is the first cell in scan order. The solver places seeds on the first free site, so any other seed could never be placed.
+	"""
+	def __init__(self, configs, identifier):
+		self.configs = []
+		self.identifier = identifier
+		self.n_duplicates = 0  # number of configurations that were dropped because they duplicate another one
+
+		canonical_forms = set()
+		for config in configs:
+			canonical_form = config.canonical_form()
+			if canonical_form in canonical_forms:
+				self.n_duplicates = self.n_duplicates + 1
+			else:
+				canonical_forms.add(canonical_form)
+				self.configs.append(config.anchored())
+
+	@property
+	def symbol(self):
+		"""
+		The symbol which marks the piece on the lattice, e.g. 'A' for 'orange (A)'.
+		"""
+		return self.identifier[-2]
+
+	@property
+	def size(self):
+		"""
+		The number of sites which the piece covers.
+		"""
+		return count_junctions(self.configs[0].links)
+
+	def __str__(self):
+		return self.identifier
+
+
+def duplicates_report(pieces):
+	"""
+	Returns one line per piece stating the number of remaining and removed configurations.
+	"""
+	return ['%s: %d configurations, %d duplicates removed' % (piece.identifier, len(piece.configs), piece.n_duplicates) for piece in pieces]
+
+
+class Config:
+	def __init__(self, links):
+		self.links = links
+
+	def create(self):
+		return [Config(self.links)]
+
+	def canonical_form(self):
+		return geometry.canonical_form(self.links)
+
+	def anchored(self):
+		"""
+		Returns the same configuration with the first cell in scan order as seed.
+		"""
+		links = geometry.anchored(self.links)
+		if links is self.links:
+			return self
+		return Config(links)
+
+	def create_all_orientations(self, symmetry):
+		"""
+		Create the configuration in every orientation which is allowed by the symmetry group of the lattice (see symmetry.Symmetry),
+		one per operation. Orientations that coincide are dropped by Piece, which counts them as duplicates.
+		"""
+		return [Config(links) for links in symmetry.images(self.links)]
+
+	def create_rotated(self, n_rotations, links=None):
+		"""
+		Create the configuration + the following (n_rotations - 1) configurations, each rotated by pi/2 with respect to the previous one.
+		"""
+		configs = []
+		links = self.links if links is None else links
+		for i in range(n_rotations):
+			configs.append(Config(links))
+			links = rotate_clockwise_by_90_degrees(links)
+		return configs
+
+	def create_all_rotated_and_mirrored_flat(self):
+		"""
+		Create the configuration + all rotated configurations (pi/2, pi, 3pi/2) + all rotations (0, pi/2, pi, 3pi/2) of the mirrored (y-axis) configuration.
+		"""
+		return self.create_rotated(4) + self.create_rotated(4, mirror_on_y_axis(self.links))
+
+	def create_all_rotated_flat(self):
+		"""
+		Create the configuration + all rotated configurations (pi/2, pi, 3pi/2).
+		"""
+		return self.create_rotated(4)
+
+	def create_and_rotate_once_flat(self):
+		"""
+		Create the configuration + one rotated configuration (pi/2).
+		"""
+		return self.create_rotated(2)
+
+	def create_and_rotate_once_and_same_for_mirrored_flat(self):
+		"""
+		Create the configuration + one rotated configuration (pi/2) + original configuration mirrored + mirrored configuration rotated once (pi/2).
+		"""
+		return self.create_rotated(2) + self.create_rotated(2, mirror_on_south_east_diagonal_axis(self.links))
+
+	def create_all_rotated_and_mirrored_elevated(self):
+		"""
+		Create the configuration + all rotated configurations (pi/2, pi, 3pi/2) + all rotations (0, pi/2, pi, 3pi/2) of the mirrored (on the plane normal to up-south-west) configuration.
+		"""
+		return self.create_rotated(4) + self.create_rotated(4, mirror_on_plane(self.links))
+
+	def create_all_rotated_elevated(self):
+		"""
+		Create the configuration + all rotated configurations (pi/2, pi, 3pi/2).
+		"""
+		return self.create_rotated(4)
+
+	def create_and_rotate_once_elevated(self):
+		"""
+		Create the configuration + one rotated configuration (pi/2).
+		"""
+		return self.create_rotated(2)
+
+	def __str__(self):
+		return str(self.links)
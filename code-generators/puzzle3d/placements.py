@@ -0,0 +1,422 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Placements of pieces on a lattice. A placement is a configuration of a piece whose seed is put on a specific site (the anchor);
+it is valid if all junctions can be reached via the links of the lattice.
+
+The placement table stores every valid placement as a bitmask over the lattice sites (bit i refers to the i-th site in scan order),
+so overlaps can be tested with a single AND. The table can be saved to disk (requires NumPy) as one .npy file per array, which
+worker processes memory-map instead of building the table themselves:
+
+    python -m puzzle3d.placements <puzzle> [--cache-dir DIR]
+"""
+
+import argparse
+import ast
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+from . import puzzles
+from .geometry import walk
+
+
+def place(neighbors, links, site):
+	"""
+	Returns the sites which are covered when the configuration's seed is put on `site` or None if the configuration leaves the lattice.
+	`neighbors` maps each site to a dict {direction: neighboring site} (see Lattice.neighbors).
+	"""
+	sites = [site]  # sites[i] is covered by junction i (see geometry.walk)
+	for prev_id, next_id, direction in walk(links):
+		site = neighbors[sites[prev_id]].get(tuple(direction))
+		if site is None:  # lattice site doesn't have the required link
+			return None
+		sites.append(site)
+	return sites
+
+
+def enumerate_placements(lattice, pieces):
+	"""
+	Yields (piece index, config index, anchor site, covered sites) for all valid placements.
+	Placements of the same piece which cover the same sites (via different configurations) are yielded only once.
+	"""
+	neighbors = lattice.neighbors()
+	for piece_id, piece in enumerate(pieces):
+		covered = set()
+		for config_id, config in enumerate(piece.configs):
+			for site in lattice.sites:
+				sites = place(neighbors, config.links, site)
+				if sites is None or len(set(sites)) < len(sites):
+					continue
+				key = frozenset(sites)
+				if key not in covered:
+					covered.add(key)
+					yield piece_id, config_id, site, sites
+
+
+def fingerprint(lattice, pieces):
+	"""
+	Returns a hash of the lattice and the configurations; a saved table is only reused if the fingerprint matches.
+	Configurations are described by their edges (see geometry.walk) since repr fails for deeply nested links.
+	"""
+	description = repr((lattice.sites, lattice.links, [(piece.identifier, [list(walk(config.links)) for config in piece.configs]) for piece in pieces]))
+	return hashlib.sha1(description.encode('ascii')).hexdigest()
+
+
+def cache_directory(name, cache_dir):
+	"""
+	Returns the directory in which the table of the specified puzzle is cached (see PlacementTable.save_mapped). Puzzle files are
+	cached under their base name and a hash of their absolute path, since files in different directories often share a name
+	(e.g. DIR/<puzzle>/puzzle.npz as written by python -m puzzle3d).
+	"""
+	if name in puzzles.PUZZLES:
+		return os.path.join(cache_dir, '%s.placements' % name)
+	path_hash = hashlib.sha1(os.path.abspath(name).encode('utf-8')).hexdigest()[:12]
+	return os.path.join(cache_dir, '%s-%s.placements' % (os.path.splitext(os.path.basename(name))[0], path_hash))
+
+
+class Ragged:
+	"""
+	Sequence of int sequences which are stored back to back in `values`; sequence i is values[offsets[i]:offsets[i+1]].
+	Items are slices of `values`, so nothing is copied if these are memoryviews of mapped files (see map_array).
+	"""
+	def __init__(self, offsets, values):
+		self.offsets = offsets
+		self.values = values
+
+	@classmethod
+	def from_lists(cls, lists):
+		offsets = [0]
+		for items in lists:
+			offsets.append(offsets[-1] + len(items))
+		return cls(offsets, [item for items in lists for item in items])
+
+	def __len__(self):
+		return len(self.offsets) - 1
+
+	def __getitem__(self, i):
+		return self.values[self.offsets[i]:self.offsets[i+1]]
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+
+class Materialized(dict):
+	"""
+	Maps i to list(sequence[i]), which is created when i is looked up first. Used for the data of a memory-mapped table that a solver
+	reads in its inner loop, where lists are faster than memoryview slices; only the parts of the table that are used are copied.
+	"""
+	def __init__(self, sequence):
+		dict.__init__(self)
+		self.sequence = sequence
+
+	def __missing__(self, i):
+		items = self[i] = list(self.sequence[i])
+		return items
+
+
+def materialized(sequence):
+	"""
+	Returns `sequence` if it is a list of lists already, otherwise a Materialized view of it.
+	"""
+	return sequence if isinstance(sequence, list) else Materialized(sequence)
+
+
+class Masks:
+	"""
+	The masks of a placement table as ints, computed on access from an array with one row of 64 bit words per mask (see PlacementTable.arrays).
+	"""
+	def __init__(self, words):
+		self.words = words
+		self.n_words = words.shape[1]
+
+	def __len__(self):
+		return self.words.shape[0]
+
+	def __getitem__(self, i):
+		words = self.words
+		mask = 0
+		for w in range(self.n_words):
+			mask = mask | (words[i, w] << (64*w))
+		return mask
+
+	def __iter__(self):
+		for i in range(len(self)):
+			yield self[i]
+
+
+# placement data that the solvers derive from the masks and pieces; saved along with the table (see PlacementTable.arrays)
+DERIVED = ['covered', 'starting', 'covering', 'conflicts', 'reach']
+MAPPED_KEYS = ['sites', 'symbols', 'sizes', 'pieces', 'configs', 'anchors', 'masks'] + DERIVED + ['%s_offsets' % key for key in DERIVED] + ['fingerprint']
+
+
+class PlacementTable:
+	def __init__(self, sites, symbols, sizes, pieces, configs, anchors, masks, fingerprint='', derived=None):
+		self.sites = sites  # all lattice sites in scan order
+		self.symbols = symbols  # symbol of each piece
+		self.sizes = sizes  # number of sites that each piece covers
+		self.pieces = pieces  # piece index of each placement
+		self.configs = configs  # config index (within the piece) of each placement
+		self.anchors = anchors  # index of the site on which the seed is placed
+		self.masks = masks  # covered sites of each placement as int bitmask
+		self.fingerprint = fingerprint
+		self._derived = {} if derived is None else derived  # the sequences in DERIVED that have been created (see _derive)
+
+	@classmethod
+	def build(cls, lattice, pieces):
+		sites = lattice.sites
+		site_ids = dict((site, i) for i, site in enumerate(sites))
+		table = cls(sites, [piece.symbol for piece in pieces], [piece.size for piece in pieces], [], [], [], [], fingerprint(lattice, pieces))
+		for piece_id, config_id, anchor, covered in enumerate_placements(lattice, pieces):
+			mask = 0
+			for site in covered:
+				mask = mask | (1 << site_ids[site])
+			table.pieces.append(piece_id)
+			table.configs.append(config_id)
+			table.anchors.append(site_ids[anchor])
+			table.masks.append(mask)
+		return table
+
+	@classmethod
+	def for_puzzle(cls, name, cache_dir=None):
+		"""
+		Returns the table of the specified puzzle. If `cache_dir` is given, the table is loaded from there (memory-mapped)
+		if it is up to date, otherwise it is built and saved there.
+		"""
+		puzzle = puzzles.load(name)
+		if cache_dir is None:
+			return cls.build(puzzle.lattice, puzzle.pieces)
+
+		directory = cache_directory(name, cache_dir)
+		if all(os.path.exists(os.path.join(directory, '%s.npy' % key)) for key in MAPPED_KEYS):
+			table = cls.load_mapped(directory)
+			if table.fingerprint == fingerprint(puzzle.lattice, puzzle.pieces):
+				return table
+		table = cls.build(puzzle.lattice, puzzle.pieces)
+		table.save_mapped(directory)
+		return table
+
+	@property
+	def n_sites(self):
+		return len(self.sites)
+
+	@property
+	def n_pieces(self):
+		return len(self.symbols)
+
+	def __len__(self):
+		return len(self.masks)
+
+	def _derive(self, key):
+		"""
+		Returns one of the sequences in DERIVED, for every placement p and site i: covered[p] are the sites that p covers, starting[i]
+		the placements whose first covered site is i, covering[i] the placements which cover i, conflicts[p] the placements that
+		can't be combined with p (they cover one of its sites or use the same piece, p included) and reach[p] the sites that are
+		covered by any of these conflicts. Built on first use unless the table was loaded.
+		"""
+		derived = self._derived
+		if key in derived:
+			return derived[key]
+		if key in ('covered', 'starting', 'covering'):
+			derived['covered'] = [[site_id for site_id in range(self.n_sites) if mask >> site_id & 1] for mask in self.masks]
+			derived['starting'] = [[] for site_id in range(self.n_sites)]
+			derived['covering'] = [[] for site_id in range(self.n_sites)]
+			for placement, site_ids in enumerate(derived['covered']):
+				derived['starting'][site_ids[0]].append(placement)
+				for site_id in site_ids:
+					derived['covering'][site_id].append(placement)
+		else:
+			covered, covering = self.covered, self.covering
+			by_piece = [[] for piece_id in range(self.n_pieces)]
+			for placement, piece_id in enumerate(self.pieces):
+				by_piece[piece_id].append(placement)
+			derived['conflicts'] = []
+			derived['reach'] = []
+			for piece_id, site_ids in zip(self.pieces, covered):
+				others = set(by_piece[piece_id])
+				for site_id in site_ids:
+					others.update(covering[site_id])
+				derived['conflicts'].append(sorted(others))
+				derived['reach'].append(sorted(set(site_id for other in others for site_id in covered[other])))
+		return derived[key]
+
+	@property
+	def covered(self):
+		return self._derive('covered')
+
+	@property
+	def starting(self):
+		return self._derive('starting')
+
+	@property
+	def covering(self):
+		return self._derive('covering')
+
+	@property
+	def conflicts(self):
+		return self._derive('conflicts')
+
+	@property
+	def reach(self):
+		return self._derive('reach')
+
+	def arrays(self):
+		"""
+		Returns the table as dict of NumPy arrays; masks are split into 64 bit words (least significant word first).
+		Each of the sequences in DERIVED is stored as two arrays, <name> with all values and <name>_offsets (see Ragged).
+		"""
+		import numpy as np
+
+		n_words = (self.n_sites + 63) // 64
+		words = np.zeros((len(self.masks), n_words), dtype=np.uint64)
+		for i, mask in enumerate(self.masks):
+			for w in range(n_words):
+				words[i, w] = (mask >> (64*w)) & 0xFFFFFFFFFFFFFFFF
+		data = {
+			'sites': np.array(self.sites, dtype=np.int32).reshape(-1, 3),
+			'symbols': np.frombuffer(''.join(self.symbols).encode('ascii'), dtype=np.uint8),
+			'sizes': np.array(self.sizes, dtype=np.int32),
+			'pieces': np.array(self.pieces, dtype=np.int32),
+			'configs': np.array(self.configs, dtype=np.int32),
+			'anchors': np.array(self.anchors, dtype=np.int32),
+			'masks': words,
+			'fingerprint': np.frombuffer(self.fingerprint.encode('ascii'), dtype=np.uint8),
+		}
+		for key in DERIVED:
+			ragged = Ragged.from_lists(self._derive(key))
+			data[key] = np.array(ragged.values, dtype=np.int32)
+			data['%s_offsets' % key] = np.array(ragged.offsets, dtype=np.int32)
+		return data
+
+	@classmethod
+	def from_arrays(cls, data):
+		"""
+		Inverse of `arrays` for memoryviews (see map_array). The per-placement data isn't copied: masks are read from the words on
+		access (see Masks) and the other arrays are indexed directly.
+		"""
+		derived = dict((key, Ragged(data['%s_offsets' % key], data[key])) for key in DERIVED)
+		return cls([tuple(site) for site in data['sites'].tolist()], list(bytes(data['symbols']).decode('ascii')), data['sizes'].tolist(),
+		           data['pieces'], data['configs'], data['anchors'], Masks(data['masks']), bytes(data['fingerprint']).decode('ascii'), derived)
+
+	def save(self, path):
+		"""
+		Saves the table as .npz file.
+		"""
+		import numpy as np
+
+		with open(path, 'wb') as fp:
+			np.savez(fp, **self.arrays())
+
+	@classmethod
+	def load(cls, path):
+		import numpy as np
+
+		with np.load(path) as data:
+			return cls.from_arrays(dict((key, as_memoryview(data[key])) for key in data.files))
+
+	def save_mapped(self, directory):
+		"""
+		Saves the table as one .npy file per array in `directory`. Unlike .npz files these can be memory-mapped (see load_mapped),
+		so processes that load the same table read it from one shared copy in the page cache. The files are written to a temporary
+		sibling directory which then replaces `directory`: files of a previous table are never overwritten (truncating a file that
+		another process maps makes that process crash), and no process sees an incomplete table.
+		"""
+		import numpy as np
+
+		parent = os.path.dirname(os.path.abspath(directory))
+		if not os.path.isdir(parent):
+			os.makedirs(parent)
+		temporary = tempfile.mkdtemp(prefix='.%s.' % os.path.basename(directory), dir=parent)
+		previous = temporary + '.previous'
+		try:
+			arrays = self.arrays()
+			for key in sorted(arrays):
+				np.save(os.path.join(temporary, '%s.npy' % key), arrays[key])
+			if os.path.exists(directory):
+				os.rename(directory, previous)  # processes that map its files keep reading them until they unmap them
+			try:
+				os.rename(temporary, directory)
+			except OSError:
+				if not os.path.isdir(directory):  # else another process has just saved the same table
+					raise
+		finally:
+			for path in (temporary, previous):
+				if os.path.isdir(path):
+					shutil.rmtree(path)
+
+	@classmethod
+	def load_mapped(cls, directory):
+		"""
+		Loads a table that was saved with `save_mapped` by memory-mapping its files; doesn't require NumPy.
+		"""
+		return cls.from_arrays(dict((key, map_array(os.path.join(directory, '%s.npy' % key))) for key in MAPPED_KEYS))
+
+
+NPY_FORMATS = {'|u1': 'B', '<i4': 'i', '<u8': 'Q'}  # dtypes of the saved arrays and the corresponding memoryview formats
+
+
+def as_memoryview(array):
+	"""
+	Returns the data of a NumPy array (with one of the dtypes in NPY_FORMATS) as memoryview of the same shape, like map_array.
+	"""
+	return memoryview(array.tobytes()).cast(NPY_FORMATS[array.dtype.str], array.shape)
+
+
+def map_array(path):
+	"""
+	Memory-maps a .npy file (as written by numpy.save) read-only and returns its data as memoryview of the array's shape.
+	Only C-ordered arrays of the dtypes in NPY_FORMATS are supported, on little-endian machines. The file can be mapped the same way
+	with numpy.load(path, mmap_mode='r').
+	"""
+	with open(path, 'rb') as fp:
+		data = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+	if data[:6] != b'\x93NUMPY':
+		raise ValueError('Not a .npy file: %s' % path)
+	if data[6] == 1:  # format version 1.0 has a 2 byte header length, later ones a 4 byte header length
+		start = 10
+		offset = start + struct.unpack('<H', data[8:10])[0]
+	else:
+		start = 12
+		offset = start + struct.unpack('<I', data[8:12])[0]
+	header = ast.literal_eval(data[start:offset].decode('latin1').strip())  # a dict literal, padded with spaces
+	if header['descr'] not in NPY_FORMATS or header['fortran_order'] or sys.byteorder != 'little':
+		raise ValueError('Unsupported array in %s: %s' % (path, header))
+	return memoryview(data)[offset:].cast(NPY_FORMATS[header['descr']], header['shape'])
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.placements', description='Build the placement table of a puzzle and save it to disk.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--cache-dir', default='.', help='directory in which the table is saved as <puzzle>.placements/ (default: current directory)')
+	args = parser.parse_args(argv)
+
+	table = PlacementTable.for_puzzle(args.puzzle, args.cache_dir)
+	print('%s: %d placements of %d pieces on %d sites' % (args.puzzle, len(table), table.n_pieces, table.n_sites))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,146 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Binary puzzle files (.npz, requires NumPy) which hold the lattice and the pieces of a puzzle, so a solver can load a puzzle
+at runtime instead of compiling generated code. All arrays are int32 unless noted otherwise:
+
+    sites               (n_sites, 3)  x, y, z of every site in scan order
+    directions          (n_directions, 3)  all direction vectors that are used by links and junctions
+    indptr              (n_sites + 1,)  adjacency in CSR format: the links of site i are indptr[i]:indptr[i+1] ...
+    indices             (n_links,)  ... of the following arrays: index of the neighboring site
+    link_directions     (n_links,)  and index of the direction pointing to it
+    identifiers         (n_pieces,)  piece identifiers (str)
+    piece_configs       (n_pieces + 1,)  configurations of piece i are piece_configs[i]:piece_configs[i+1]
+    config_junctions    (n_configs + 1,)  junctions of configuration i are config_junctions[i]:config_junctions[i+1] ...
+    junction_parents    (n_junctions,)  ... of the following arrays: index of the preceding junction within the configuration (-1 for the seed)
+    junction_directions (n_junctions,)  and index of the direction from the preceding junction (-1 for the seed)
+
+Junctions are stored such that every junction follows its preceding junction. The files are written along with the generated code:
+
+    python -m puzzle3d [puzzle ...] --output-dir DIR
+"""
+
+from .geometry import links_from_tree, tree
+from .lattice import Lattice
+from .pieces import Config, Piece
+
+
+class Puzzle:
+	"""
+	Puzzle that was loaded from a file; provides `lattice` and `pieces` like the modules in puzzle3d.puzzles.
+	"""
+	def __init__(self, lattice, pieces):
+		self.lattice = lattice
+		self.pieces = pieces
+
+
+def save(path, lattice, pieces):
+	import numpy as np
+
+	# directions of the links in order of their first use, followed by the ones that are only used by junctions
+	links = lattice.link_array()
+	link_directions, first, inverse = np.unique(links[:, 2:], axis=0, return_index=True, return_inverse=True)
+	order = np.argsort(first)
+	ranks = np.empty_like(order)
+	ranks[order] = np.arange(len(order))
+	directions = [tuple(direction) for direction in link_directions[order].tolist()]
+	direction_ids = dict((direction, i) for i, direction in enumerate(directions))
+
+	def direction_id(direction):
+		direction = tuple(direction)
+		if direction not in direction_ids:
+			direction_ids[direction] = len(directions)
+			directions.append(direction)
+		return direction_ids[direction]
+
+	sites = lattice.sites
+	by_site = np.argsort(links[:, 0], kind='stable')  # keeps the order of the links of each site
+	indptr = np.concatenate(([0], np.cumsum(np.bincount(links[:, 0], minlength=len(sites)))))
+
+	piece_configs = [0]
+	config_junctions = [0]
+	junction_parents = []
+	junction_directions = []
+	for piece in pieces:
+		for config in piece.configs:
+			positions, edges = tree(config.links)
+			parents = [(-1, -1)] * len(positions)
+			for prev_id, branches in enumerate(edges):
+				for next_id, direction in branches:
+					parents[next_id] = (prev_id, direction_id(direction))
+			junction_parents.extend(parent for parent, direction in parents)
+			junction_directions.extend(direction for parent, direction in parents)
+			config_junctions.append(len(junction_parents))
+		piece_configs.append(len(config_junctions) - 1)
+
+	with open(path, 'wb') as fp:
+		np.savez(fp,
+		         sites=np.array(sites, dtype=np.int32).reshape(-1, 3),
+		         directions=np.array(directions, dtype=np.int32).reshape(-1, 3),
+		         indptr=indptr.astype(np.int32),
+		         indices=links[by_site, 1].astype(np.int32),
+		         link_directions=ranks[inverse.reshape(-1)][by_site].astype(np.int32),
+		         identifiers=np.array([piece.identifier for piece in pieces]),
+		         piece_configs=np.array(piece_configs, dtype=np.int32),
+		         config_junctions=np.array(config_junctions, dtype=np.int32),
+		         junction_parents=np.array(junction_parents, dtype=np.int32),
+		         junction_directions=np.array(junction_directions, dtype=np.int32))
+
+
+def load(path):
+	"""
+	Returns the puzzle (see Puzzle) stored in the given file.
+	"""
+	import numpy as np
+
+	with np.load(path) as data:
+		sites = [tuple(site) for site in data['sites'].tolist()]
+		directions = [tuple(direction) for direction in data['directions'].tolist()]
+		links = np.column_stack((np.repeat(np.arange(len(sites)), np.diff(data['indptr'])), data['indices'],
+		                         data['directions'][data['link_directions']])).astype(np.int64)
+		identifiers = data['identifiers'].tolist()
+		piece_configs = data['piece_configs'].tolist()
+		config_junctions = data['config_junctions'].tolist()
+		junction_parents = data['junction_parents'].tolist()
+		junction_directions = data['junction_directions'].tolist()
+
+	lattice = Lattice()
+	for site in sites:  # sites are in scan order, so a new layer (row) starts whenever z (y) changes
+		if not lattice.layers or lattice.layers[-1][-1][-1][2] != site[2]:
+			lattice.add_layer()
+			lattice.add_row()
+		elif lattice.layers[-1][-1][-1][1] != site[1]:
+			lattice.add_row()
+		lattice.add_site(*site)
+	lattice.set_link_array(links)
+
+	pieces = []
+	for piece_id, identifier in enumerate(identifiers):
+		configs = []
+		for config_id in range(piece_configs[piece_id], piece_configs[piece_id+1]):
+			first = config_junctions[config_id]
+			edges = [[] for junc_id in range(first, config_junctions[config_id+1])]
+			for junc_id in range(1, len(edges)):
+				edges[junction_parents[first+junc_id]].append((junc_id, directions[junction_directions[first+junc_id]]))
+			configs.append(Config(links_from_tree(edges)))
+		pieces.append(Piece(configs, identifier))
+	return Puzzle(lattice, pieces)
@@ -0,0 +1,50 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Declarative puzzle definitions. Each puzzle module provides a `lattice` (puzzle3d.lattice.Lattice) and a list of `pieces` (puzzle3d.pieces.Piece).
+"""
+
+import importlib
+import os
+
+from .. import puzzlefile
+
+
+PUZZLES = [
+	'iqfit',
+	'lonpos_flat',
+	'lonpos_crazy_cone',
+	'lonpos_pyramid_4x4',
+	'lonpos_pyramid_5x5',
+]
+
+
+def load(name):
+	"""
+	Returns the module of the specified puzzle; modules are imported only once per process.
+	`name` can also be the path of a puzzle file (see puzzle3d.puzzlefile).
+	"""
+	if name.endswith('.npz') and os.path.isfile(name):
+		return puzzlefile.load(name)
+	if name not in PUZZLES:
+		raise ValueError('Unknown puzzle: %s (available: %s)' % (name, ', '.join(PUZZLES)))
+	return importlib.import_module('%s.%s' % (__name__, name))
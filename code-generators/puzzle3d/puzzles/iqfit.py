@@ -0,0 +1,150 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+
+"""
+IQFit
+"""
+
+from ..directions import up, right, down, left
+from ..lattice import rectangular_lattice
+from ..pieces import Piece, Config
+
+
+lattice = rectangular_lattice(x_extent=5, y_extent=10)
+
+pieces = []
+
+lightgreen = Piece(
+	Config( [ right, down, down ] ).create_and_rotate_once_flat() +\
+	Config( [ [[ right, right ], [ down ]] ] ).create() +\
+	Config( [ down, down, right ] ).create() +\
+	Config( [ down, right, right, up ] ).create() +\
+	Config( [ [[ right ], [ down, down, right ]] ] ).create() +\
+	Config( [ [[ down ], [ right, right, down ]] ] ).create() +\
+	Config( [ right, down, down, left ] ).create(),
+	'lightgreen (A)'
+)
+pieces.append(lightgreen)
+
+darkgreen = Piece(
+	Config( [ down, [[ right ], [ down ]] ] ).create() +\
+	Config( [ down, [[ left ], [ right ]] ] ).create() +\
+	Config( [ right, [[ down ], [ right ]] ] ).create_and_rotate_once_flat() +\
+	Config( [ down, down, right, up ] ).create() +\
+	Config( [ down, right, up, right ] ).create() +\
+	Config( [ right, down, [[ left ], [ down ]] ] ).create() +\
+	Config( [ right, down, left, left ] ).create(),
+	'darkgreen (B)'
+)
+pieces.append(darkgreen)
+
+purple = Piece(
+	Config( [ down, right, right ] ).create() +\
+	Config( [ [[ down, down ], [ right ]] ] ).create() +\
+	Config( [ right, right, down ] ).create_and_rotate_once_flat() +\
+	Config( [ right, right, down, left ] ).create_and_rotate_once_flat() +\
+	Config( [ right, down, left, down ] ).create() +\
+	Config( [ down, right, [[ up ], [ right ]] ] ).create(),
+	'purple (C)'
+)
+pieces.append(purple)
+
+darkblue = Piece(
+	Config( [ down, [[ right ], [ down ]] ] ).create() +\
+	Config( [ down, [[ left ], [ right ]] ] ).create() +\
+	Config( [ right, [[ down ], [ right ]] ] ).create_and_rotate_once_flat() +\
+	Config( [ down, right, right, up ] ).create() +\
+	Config( [ [[ right ], [ down, down, right ]] ] ).create() +\
+	Config( [ [[ down ], [ right, right, down ]] ] ).create() +\
+	Config( [ right, down, down, left ] ).create(),
+	'darkblue (D)'
+)
+pieces.append(darkblue)
+
+blue = Piece(
+	Config( [ right, down, down, down ] ).create_and_rotate_once_flat() +\
+	Config( [ [[ right, right, right ], [ down ]] ] ).create() +\
+	Config( [ down, down, down, right ] ).create() +\
+	Config( [ right, [[ down ], [ right, right, down ]] ] ).create_and_rotate_once_flat() +\
+	Config( [ [[ right ], [ down, down, [[ right ], [ down ]] ]] ] ).create() +\
+	Config( [ down, right, right, [[ up ], [ right ]] ] ).create_and_rotate_once_flat(),
+	'blue (E)'
+)
+pieces.append(blue)
+
+red = Piece(
+	Config( [ right, down, down, down ] ).create_and_rotate_once_flat() +\
+	Config( [ [[ right, right, right ], [ down ]] ] ).create() +\
+	Config( [ down, down, down, right ] ).create() +\
+	Config( [ down, right, right, right, up ] ).create() +\
+	Config( [ [[ right ], [ down, down, down, right ]] ] ).create() +\
+	Config( [ [[ down ], [ right, right, right, down ]] ] ).create() +\
+	Config( [ right, down, down, down, left ] ).create(),
+	'red (F)'
+)
+pieces.append(red)
+
+orange = Piece(
+	Config( [ down, down, [[ right ], [ down ]] ] ).create() +\
+	Config( [ down, [[ left, left ], [ right ]] ] ).create() +\
+	Config( [ right, [[ down ], [ right, right ]] ] ).create_and_rotate_once_flat() +\
+	Config( [ down, [[ right ], [ down, down, right ]] ] ).create() +\
+	Config( [ down, [[ left ], [ right, right, up ]] ] ).create() +\
+	Config( [ [[ down ], [ right, right, [[ down ], [ right ]] ]] ] ).create() +\
+	Config( [ right, down, down, [[ left ], [ down ]] ] ).create(),
+	'orange (G)'
+)
+pieces.append(orange)
+
+lightblue = Piece(
+	Config( [ down, down, [[ right ], [ down ]] ] ).create() +\
+	Config( [ down, [[ left, left ], [ right ]] ] ).create() +\
+	Config( [ right, [[ down ], [ right, right ]] ] ).create_and_rotate_once_flat() +\
+	Config( [ down, [[ right ], [ down, [[ right ], [ down ]] ]] ] ).create() +\
+	Config( [ down, [[ left ], [ right, [[ up ], [ right ]] ]] ] ).create() +\
+	Config( [ right, [[ down ], [ right, [[ down ], [ right ]] ]] ] ).create_and_rotate_once_flat(),
+	'lightblue (H)'
+)
+pieces.append(lightblue)
+
+rose = Piece(
+	Config( [ down, [[ right ], [ down, down ]] ] ).create() +\
+	Config( [ down, [[ left ], [ right, right ]] ] ).create() +\
+	Config( [ right, right, [[ down ], [ right ]] ] ).create_and_rotate_once_flat() +\
+	Config( [ down, down, down, right, up ] ).create() +\
+	Config( [ down, right, up, right, right ] ).create() +\
+	Config( [ right, down, [[ left ], [ down, down ]] ] ).create() +\
+	Config( [ right, down, left, left, left ] ).create(),
+	'rose (I)'
+)
+pieces.append(rose)
+
+yellow = Piece(
+	Config( [ down, right, right, right ] ).create() +\
+	Config( [ [[ down, down, down ], [ right ]] ] ).create() +\
+	Config( [ right, right, right, down ] ).create_and_rotate_once_flat() +\
+	Config( [ right, right, right, down, left ] ).create_and_rotate_once_flat() +\
+	Config( [ right, down, left, down, down ] ).create() +\
+	Config( [ down, right, [[ up ], [ right, right ]] ] ).create(),
+	'yellow (J)'
+)
+pieces.append(yellow)
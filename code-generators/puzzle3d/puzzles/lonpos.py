@@ -0,0 +1,57 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+The 12 pieces of Lonpos 101, each one given by a single configuration on the square lattice.
+All other configurations follow from the symmetry group of the lattice on which the pieces are used.
+"""
+
+from ..directions import up, right, down, left
+from ..pieces import Piece, Config
+from ..transformations import transform
+
+
+shapes = [
+	('orange (A)', [ down, right, right ]),
+	('red (B)', [ down, down, left, up ]),
+	('blue (C)', [ right, up, up, up ]),
+	('pinkish (D)', [ down, down, [[ left ], [ down ]] ]),
+	('green (E)', [ down, down, left, down ]),
+	('white (F)', [ down, left ]),
+	('lightblue (G)', [ down, down, left, left ]),
+	('rose (H)', [ down, left, down, left ]),
+	('yellow (I)', [ down, right, right, up ]),
+	('purple (J)', [ down, down, down ]),
+	('lightgreen (K)', [ right, down, left ]),
+	('grey (L)', [ down, [[ left ], [ down ], [ right ]] ]),
+]
+
+
+def create_pieces(symmetry, directions=None):
+	"""
+	Creates all pieces with all orientations allowed by `symmetry`. If given, `directions` maps the directions of the square lattice to the ones used by the puzzle.
+	"""
+	pieces = []
+	for identifier, links in shapes:
+		if directions is not None:
+			links = transform(links, directions.__getitem__)
+		pieces.append(Piece(Config(links).create_all_orientations(symmetry), identifier))
+	return pieces
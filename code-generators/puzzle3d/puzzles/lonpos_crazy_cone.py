@@ -0,0 +1,34 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Lonpos 101 (crazy cone)
+"""
+
+from ..directions import up, right, down, left, ne, se, sw, nw
+from ..lattice import cone_lattice
+from ..symmetry import Symmetry
+from . import lonpos
+
+
+lattice = cone_lattice(y_extent=10)
+
+pieces = lonpos.create_pieces(Symmetry.of(lattice), {up: ne, right: se, down: sw, left: nw})  # the lattice is rotated by pi/4 with respect to the square lattice
@@ -0,0 +1,33 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Lonpos 101 (flat, 5x11 board)
+"""
+
+from ..lattice import rectangular_lattice
+from ..symmetry import Symmetry
+from . import lonpos
+
+
+lattice = rectangular_lattice(x_extent=5, y_extent=11)
+
+pieces = lonpos.create_pieces(Symmetry.of(lattice))
@@ -0,0 +1,35 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Lonpos 101 (4x4 pyramid)
+
+Note: Puzzle will be solved from top to bottom!
+"""
+
+from ..lattice import pyramid_lattice
+from ..symmetry import Symmetry
+from . import lonpos
+
+
+lattice = pyramid_lattice(z_extent=4)
+
+pieces = lonpos.create_pieces(Symmetry.of(lattice))
@@ -0,0 +1,236 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Writes the solutions of the Python solvers to a file (or stdout) in one of the following formats:
+
+    text   one line per solution in the format of Lattice::toStringLightweight (the default, same as before)
+    bytes  n_sites bytes per solution: 0 for a free site, 1 + the piece index for an occupied one
+    ids    per solution the number of placements (1 byte) followed by the placement indices (little-endian uint32)
+
+The binary formats can only be read along with the placement table of the puzzle (see read_solutions). Records are collected
+in a buffer that is written once it holds `buffer_size` bytes, and the file can be compressed with gzip or zstd (the latter
+requires the zstandard package). The solvers select this with:
+
+    python -m puzzle3d.bitboard <puzzle> [--output PATH] [--format text|bytes|ids] [--compression none|gzip|zstd]
+"""
+
+import gzip
+import struct
+import sys
+
+
+FORMATS = ['text', 'bytes', 'ids']
+COMPRESSIONS = ['none', 'gzip', 'zstd']
+MAGIC = {b'\x1f\x8b': 'gzip', b'\x28\xb5\x2f\xfd': 'zstd'}  # leading bytes of compressed files
+
+
+def _zstandard():
+	try:
+		import zstandard
+	except ImportError:
+		raise ImportError('zstd compression requires the zstandard package')
+	return zstandard
+
+
+def open_output(path, compression='none'):
+	"""
+	Opens the given file (stdout for '-') for writing binary data, compressed as specified.
+	"""
+	if compression not in COMPRESSIONS:
+		raise ValueError('unknown compression: %s' % compression)
+	if path == '-':
+		fp = sys.stdout.buffer
+	elif compression == 'gzip':
+		return gzip.open(path, 'wb', 6)
+	else:
+		fp = open(path, 'wb')
+	if compression == 'gzip':
+		return gzip.GzipFile(fileobj=fp, mode='wb', compresslevel=6)
+	if compression == 'zstd':
+		return _zstandard().ZstdCompressor().stream_writer(fp, closefd=path != '-')
+	return fp
+
+
+def open_input(path):
+	"""
+	Opens the given file (stdin for '-') for reading binary data; gzip and zstd compression are detected from the leading bytes.
+	"""
+	fp = sys.stdin.buffer if path == '-' else open(path, 'rb')
+	head = fp.peek(4)[:4] if hasattr(fp, 'peek') else b''
+	if head[:2] in MAGIC:
+		if path == '-':
+			return gzip.GzipFile(fileobj=fp, mode='rb')
+		fp.close()
+		return gzip.open(path, 'rb')
+	if head in MAGIC:
+		return _zstandard().ZstdDecompressor().stream_reader(fp, closefd=path != '-')
+	return fp
+
+
+def _read(fp, size):
+	"""
+	Reads `size` bytes (fewer only at the end of the file); decompressing readers may return less per call.
+	"""
+	data = fp.read(size)
+	while 0 < len(data) < size:
+		chunk = fp.read(size - len(data))
+		if not chunk:
+			break
+		data = data + chunk
+	return data
+
+
+class SolutionSink:
+	"""
+	Encodes solutions (lists of placement indices) in one of FORMATS and writes them to a binary file object.
+	"""
+	def __init__(self, table, fp, format='text', buffer_size=1 << 20):
+		if format not in FORMATS:
+			raise ValueError('unknown format: %s' % format)
+		self.table = table
+		self.fp = fp
+		self.format = format
+		self.buffer_size = buffer_size
+		self.buffer = []
+		self.buffered = 0  # number of bytes in the buffer
+		self.count = 0  # number of solutions written so far
+
+		# per placement the covered site indices and the value that is written to them
+		self.covered = table.covered
+		if format == 'text':
+			self.values = [ord(table.symbols[piece_id]) for piece_id in table.pieces]
+			self.empty = bytearray(b'0' * table.n_sites)
+		else:
+			self.values = [piece_id + 1 for piece_id in table.pieces]
+			self.empty = bytearray(table.n_sites)
+
+	def encode(self, solution):
+		"""
+		Returns the record of the given solution as bytes.
+		"""
+		if self.format == 'ids':
+			return struct.pack('<B%dI' % len(solution), len(solution), *solution)
+		record = bytearray(self.empty)
+		values = self.values
+		covered = self.covered
+		for placement in solution:
+			value = values[placement]
+			for site_id in covered[placement]:
+				record[site_id] = value
+		if self.format == 'text':
+			record.append(10)  # '\n'
+		return bytes(record)
+
+	def write(self, solution):
+		record = self.encode(solution)
+		self.buffer.append(record)
+		self.buffered = self.buffered + len(record)
+		self.count = self.count + 1
+		if self.buffered >= self.buffer_size:
+			self.flush()
+
+	def write_all(self, solutions):
+		"""
+		Writes all solutions of the given iterable and returns their number.
+		"""
+		count = self.count
+		for solution in solutions:
+			self.write(solution)
+		return self.count - count
+
+	def flush(self):
+		if self.buffer:
+			self.fp.write(b''.join(self.buffer))
+			self.buffer = []
+			self.buffered = 0
+		self.fp.flush()
+
+	def close(self):
+		self.flush()
+		if self.fp is not sys.stdout.buffer:
+			self.fp.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+
+def read_solutions(path, table=None, format='text'):
+	"""
+	Yields the solutions stored in the given file in the format of Lattice::toStringLightweight. The binary formats require the
+	placement table of the puzzle.
+	"""
+	if format not in FORMATS:
+		raise ValueError('unknown format: %s' % format)
+	if format != 'text' and table is None:
+		raise ValueError('reading the %s format requires the placement table' % format)
+	fp = open_input(path)
+	try:
+		if format == 'text':
+			pending = b''
+			while True:
+				chunk = fp.read(1 << 20)
+				lines = (pending + chunk).split(b'\n')
+				pending = lines.pop() if chunk else b''
+				for line in lines:
+					line = line.strip()
+					if line:
+						yield line.decode('ascii')
+				if not chunk:
+					break
+		elif format == 'bytes':
+			symbols = '0' + ''.join(table.symbols)
+			while True:
+				record = _read(fp, table.n_sites)
+				if len(record) < table.n_sites:
+					break
+				yield ''.join(symbols[value] for value in bytearray(record))
+		else:
+			sink = SolutionSink(table, None)
+			while True:
+				count = _read(fp, 1)
+				if not count:
+					break
+				count = bytearray(count)[0]
+				yield sink.encode(struct.unpack('<%dI' % count, _read(fp, 4 * count)))[:-1].decode('ascii')
+	finally:
+		if fp is not sys.stdin.buffer:
+			fp.close()
+
+
+def add_arguments(parser):
+	"""
+	Adds the options --output, --format, --compression and --buffer-size to the given argparse parser.
+	"""
+	parser.add_argument('--output', default='-', help='file to which the solutions are written (default: stdout)')
+	parser.add_argument('--format', choices=FORMATS, default='text', help='format of the solutions (default: text)')
+	parser.add_argument('--compression', choices=COMPRESSIONS, default='none', help='compression of the output (default: none)')
+	parser.add_argument('--buffer-size', type=int, default=1 << 20, help='number of bytes that are collected before each write (default: 1 MiB)')
+
+
+def open_sink(table, args):
+	"""
+	Returns the SolutionSink selected by the options of add_arguments.
+	"""
+	return SolutionSink(table, open_output(args.output, args.compression), args.format, args.buffer_size)
@@ -0,0 +1,227 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Solves a puzzle with worker processes that share their work dynamically:
+
+    python -m puzzle3d.stealing <puzzle> [--processes N] [--steps S]
+
+The subtrees of the search tree differ a lot in size, so splitting the tree up front (see puzzle3d.parallel) leaves workers idle
+while others are still busy. Here the search starts with a single node (the empty board) and a worker checks after every S placements
+whether other workers are waiting for work. If so, it gives away the untried candidates of the shallowest level of its search
+(the largest unexplored subtrees) and the idle workers take them. A node is described by the list of placements made so far.
+
+Every node of the tree is explored by exactly one worker, so the solutions are the same as for a serial run.
+Load balance statistics are reported per worker on stderr.
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+from . import puzzles, sink
+from .bitboard import Search, Solver, write_branches
+from .placements import PlacementTable, cache_directory
+
+
+STATISTICS = ['nodes', 'donated', 'placements', 'solutions', 'busy', 'idle']  # statistics that are collected per worker
+
+
+def _worker(directory, max_steps, tasks, results, idle, queued, count=False):
+	"""
+	Main function of a worker process: loads the placement table from `directory` and solves nodes from `tasks` until it receives None.
+	Sends ('solutions', list of solutions), ('nodes', donated nodes), ('finished',) and finally ('statistics', pid, dict, branches) to `results`.
+	`idle` is the number of workers waiting for a node, `queued` the number of nodes in `tasks`. With `count` no solutions are sent;
+	they are counted in `branches` per first placement instead (None otherwise).
+	If anything fails, ('error', pid, traceback) is sent and the worker exits.
+	"""
+	try:
+		_work(directory, max_steps, tasks, results, idle, queued, count)
+	except Exception:
+		results.put(('error', os.getpid(), traceback.format_exc()))
+
+
+def _work(directory, max_steps, tasks, results, idle, queued, count):
+	solver = Solver(PlacementTable.load_mapped(directory))
+	statistics = dict((key, 0) for key in STATISTICS)
+	branches = {} if count else None
+	while True:
+		with idle.get_lock():
+			idle.value = idle.value + 1
+		start_time = time.time()
+		node = tasks.get()
+		with idle.get_lock():
+			idle.value = idle.value - 1
+		statistics['idle'] = statistics['idle'] + time.time() - start_time
+		if node is None:
+			break
+		with queued.get_lock():
+			queued.value = queued.value - 1
+
+		start_time = time.time()
+		search = Search(solver, node)
+		while not search.finished:
+			solutions = list(search.run(max_steps, branches))
+			if solutions:
+				results.put(('solutions', solutions))
+				statistics['solutions'] = statistics['solutions'] + len(solutions)
+			if idle.value > queued.value:
+				nodes = search.split()
+				if nodes:
+					results.put(('nodes', nodes))
+					statistics['donated'] = statistics['donated'] + len(nodes)
+		results.put(('finished',))
+		statistics['nodes'] = statistics['nodes'] + 1
+		statistics['placements'] = statistics['placements'] + search.steps
+		statistics['busy'] = statistics['busy'] + time.time() - start_time
+	if branches is not None:
+		statistics['solutions'] = sum(branches.values())
+	results.put(('statistics', os.getpid(), statistics, branches))
+
+
+def _receive(results, workers):
+	"""
+	Returns the next message from the workers. Raises RuntimeError if a worker failed, i.e. sent an error or died without one
+	(e.g. killed by a signal), since its node would never be finished.
+	"""
+	while True:
+		try:
+			message = results.get(timeout=1)
+		except queue.Empty:
+			for worker in workers:
+				if worker.exitcode not in (None, 0):
+					raise RuntimeError('worker %d exited with code %d' % (worker.pid, worker.exitcode))
+			continue
+		if message[0] == 'error':
+			raise RuntimeError('worker %d failed:\n%s' % (message[1], message[2]))
+		return message
+
+
+def solve(table, directory, processes=None, max_steps=1000, statistics=None, branches=None):
+	"""
+	Yields all solutions of the puzzle of `table` (each as a tuple of sorted placement indices). `directory` holds the same table
+	saved by PlacementTable.save_mapped, which the workers memory-map.
+	If `statistics` is given (a dict), it is filled with {worker pid: {statistic: value}} (see STATISTICS) once all solutions are found.
+	If `branches` is given (a dict), the solutions are only counted in it per first placement instead (see bitboard.Search.run).
+	"""
+	if processes is None:
+		processes = multiprocessing.cpu_count()
+	tasks = multiprocessing.Queue()
+	results = multiprocessing.Queue()
+	idle = multiprocessing.Value('i', 0)
+	queued = multiprocessing.Value('i', 0)
+	workers = [multiprocessing.Process(target=_worker, args=(directory, max_steps, tasks, results, idle, queued, branches is not None))
+	           for i in range(processes)]
+	for worker in workers:
+		worker.daemon = True
+		worker.start()
+
+	try:
+		outstanding = 1  # nodes which are queued or being solved
+		with queued.get_lock():
+			queued.value = queued.value + 1
+		tasks.put([])
+		while outstanding > 0:
+			message = _receive(results, workers)
+			if message[0] == 'solutions':
+				for solution in message[1]:
+					yield tuple(sorted(solution))
+			elif message[0] == 'nodes':
+				outstanding = outstanding + len(message[1])  # counted before any of them can be finished
+				with queued.get_lock():
+					queued.value = queued.value + len(message[1])
+				for node in message[1]:
+					tasks.put(node)
+			else:
+				outstanding = outstanding - 1
+
+		for worker in workers:
+			tasks.put(None)
+		for worker in workers:
+			message = _receive(results, workers)
+			if statistics is not None:
+				statistics[message[1]] = message[2]
+			if branches is not None:
+				for placement, n_solutions in message[3].items():
+					branches[placement] = branches.get(placement, 0) + n_solutions
+		for worker in workers:
+			worker.join()
+	finally:
+		for worker in workers:
+			if worker.is_alive():
+				worker.terminate()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m puzzle3d.stealing', description='Find all solutions of a puzzle with worker processes that share their work.')
+	parser.add_argument('puzzle', help='one of: %s (or the path of a puzzle file)' % ', '.join(puzzles.PUZZLES))
+	parser.add_argument('--processes', type=int, default=None, help='number of worker processes (default: number of CPUs)')
+	parser.add_argument('--steps', type=int, default=1000, help='number of placements after which a worker checks for idle workers (default: 1000)')
+	parser.add_argument('--cache-dir', help='load (or save) the placement table from (to) this directory')
+	parser.add_argument('--count', action='store_true', help='only count the solutions (per first placement) instead of writing them')
+	sink.add_arguments(parser)
+	args = parser.parse_args(argv)
+
+	start_time = time.time()
+	temporary_dir = None
+	cache_dir = args.cache_dir
+	if cache_dir is None:
+		cache_dir = temporary_dir = tempfile.mkdtemp()
+	statistics = {}
+	try:
+		table = PlacementTable.for_puzzle(args.puzzle, cache_dir)  # saved once, the workers memory-map it
+		directory = cache_directory(args.puzzle, cache_dir)
+		if args.count:
+			branches = {}
+			for solution in solve(table, directory, args.processes, args.steps, statistics, branches):
+				pass
+			write_branches(Solver(table), branches)
+			n_solutions = sum(branches.values())
+		else:
+			with sink.open_sink(table, args) as output:
+				n_solutions = output.write_all(solve(table, directory, args.processes, args.steps, statistics))
+	finally:
+		if temporary_dir is not None:
+			shutil.rmtree(temporary_dir)
+	elapsed = time.time() - start_time
+
+	sys.stderr.write('%-8s %8s %8s %12s %10s %8s %8s\n' % ('worker', 'nodes', 'donated', 'placements', 'solutions', 'busy', 'idle'))
+	for pid in sorted(statistics):
+		worker = statistics[pid]
+		sys.stderr.write('%-8d %8d %8d %12d %10d %8.2f %8.2f\n' % ((pid,) + tuple(worker[key] for key in STATISTICS)))
+	busy = [worker['busy'] for worker in statistics.values()]
+	placements = [worker['placements'] for worker in statistics.values()]
+	if sum(busy) > 0 and sum(placements) > 0:
+		# a perfectly balanced run has a ratio of 1 between the busiest worker and the average worker
+		sys.stderr.write('load imbalance (max / mean): %.2f busy time, %.2f placements\n'
+		                 % (max(busy) * len(busy) / sum(busy), max(placements) * len(placements) / float(sum(placements))))
+	sys.stderr.write('computing time: %.2f seconds\n' % elapsed)
+	sys.stderr.write('number of solutions found: %d\n' % n_solutions)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,98 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Symmetry group of a lattice, i.e. all rotations and mirror operations which map the lattice's set of directions onto itself.
+
+The operations are found as those permutations of the directions which preserve all pairwise scalar products of the corresponding
+displacements (see geometry.displacement), where the layer spacing of pyramids is 1/sqrt(2) times the lattice spacing
+(such that links between layers are as long as links within a layer). For the square lattice this yields the 8 operations of a square,
+for pyramids the 48 operations of a cube (pieces can lie within a layer or within one of the two families of tilted planes).
+"""
+
+from .geometry import anchored, canonical_form, displacement
+from .transformations import transform
+
+
+def scalar_product(direction1, direction2):
+	"""
+	Returns 4 times the scalar product of the corresponding displacements (which keeps the result integer).
+	"""
+	d1 = displacement(direction1)
+	d2 = displacement(direction2)
+	return d1[0]*d2[0] + d1[1]*d2[1] + 2*d1[2]*d2[2]
+
+
+class Symmetry:
+	def __init__(self, directions):
+		self.directions = sorted(set(tuple(direction) for direction in directions))
+		self.operations = self.find_operations()  # each operation is a dict which maps a direction to its image
+
+	@classmethod
+	def of(cls, lattice):
+		"""
+		Returns the symmetry group of the directions used by the lattice's links.
+		"""
+		return cls(map(tuple, lattice.link_array()[:, 2:].tolist()))
+
+	def find_operations(self):
+		"""
+		Finds all permutations of the directions which preserve the scalar products by extending partial assignments one direction at a time.
+		The identity is always the first operation.
+		"""
+		directions = self.directions
+		products = [[scalar_product(d1, d2) for d2 in directions] for d1 in directions]
+		operations = []
+
+		def extend(images):  # images[k] is the index of the image of directions[k]
+			i = len(images)
+			if i == len(directions):
+				operations.append(dict((directions[k], directions[images[k]]) for k in range(i)))
+				return
+			for j in range(len(directions)):
+				if j not in images and all(products[j][images[k]] == products[i][k] for k in range(i)) and products[j][j] == products[i][i]:
+					extend(images + [j])
+
+		extend([])
+		return operations
+
+	def images(self, links):
+		"""
+		Returns the links of a configuration transformed by every operation (the identity first). A configuration that is symmetric
+		under some of the operations yields the same orientation several times.
+		"""
+		return [transform(links, lambda elem: operation[tuple(elem)]) for operation in self.operations]
+
+	def orientations(self, links):
+		"""
+		Returns the links of all distinct orientations of a configuration, each with the first cell in scan order as seed.
+		"""
+		orientations = []
+		canonical_forms = set()
+		for new_links in self.images(links):
+			form = canonical_form(new_links)
+			if form not in canonical_forms:
+				canonical_forms.add(form)
+				orientations.append(anchored(new_links))
+		return orientations
+
+	def __len__(self):
+		return len(self.operations)
@@ -0,0 +1,83 @@
+######################################################################################
+#
+# This program solves various 3D puzzles.
+# Copyright (C) 2016  Dominik Vilsmeier
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+######################################################################################
+
+
+"""
+Rotations and mirror operations on configurations (see puzzle3d.pieces for the notation of links).
+"""
+
+
+def transform(links, vector_map):
+	"""
+	Applies `vector_map` to every vector of the links while preserving the structure of branches.
+	"""
+	new_links = []
+	stack = [(links, new_links)]  # branches that are still to be transformed, along with the list that receives them
+	while stack:
+		links, target = stack.pop()
+		for elem in links:
+			if isinstance(elem, list):  # more than one branch
+				branch_list = [[] for branch in elem]
+				target.append(branch_list)
+				stack.extend(zip(elem, branch_list))
+			else:
+				target.append(vector_map(elem))
+	return new_links
+
+
+def rotate_clockwise_by_90_degrees(links):
+	"""
+	Rotates vector by pi/2 around the z-axis: x -> -y, y -> x, z -> z.
+	"""
+	return transform(links, lambda elem: (-elem[1], elem[0], elem[2]))  # rotated vector
+
+
+def mirror_on_y_axis(links):
+	"""
+	Mirrors vector on the y-axis: x -> -x, y -> y, z -> z.
+	"""
+	return transform(links, lambda elem: (-elem[0], elem[1], elem[2]))  # mirrored vector
+
+
+def mirror_on_vectors(links, normal_vectors):
+	"""
+	Reverses those vectors that are contained in `normal_vectors`, all other vectors remain unchanged.
+	"""
+	def mirror(elem):
+		if elem in normal_vectors:
+			return (-elem[0], -elem[1], -elem[2])  # mirrored vector
+		return (elem[0], elem[1], elem[2])  # vector remains unchanged
+	return transform(links, mirror)
+
+
+def mirror_on_plane(links):
+	"""
+	Mirrors vector on the plane that is that is normal to (-1,1,-1) (up-south-west):
+	x -> -x, y -> -y, z -> -z   if vector in normal_vectors
+	x ->  x, y ->  y, z ->  z   else
+	"""
+	return mirror_on_vectors(links, [(1,-1,1), (-1,1,-1)])  # the normal vectors of the plane
+
+
+def mirror_on_south_east_diagonal_axis(links):
+	"""
+	Mirrors vector on the line (1,1,0).
+	"""
+	return mirror_on_vectors(links, [(-1,1,0), (1,-1,0)])
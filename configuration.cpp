@@ -19,20 +19,82 @@
  ***************************************************************************************/
 
 #include "configuration.h"
-#include "junction.h"
+#include "latticesite.h"
+#include "piece.h"
+#include "vector3d.h"
 #include <string>
 #include <sstream>
 
 using namespace std;
 
-Configuration::Configuration()
-{}
+Configuration::Configuration(const int* data, size_t numberOfJunctions)
+		: parents(numberOfJunctions), directionIds(numberOfJunctions), sites(numberOfJunctions, 0)
+{
+	for(size_t i=0; i<numberOfJunctions; ++i) {
+		parents[i] = data[2*i];
+		directionIds[i] = data[2*i+1];
+	}
+}
+
+bool Configuration::place(LatticeSite* seed, Piece* piece) {
+
+	LatticeSite* site = seed;
+	for(size_t i=0; i<parents.size(); ++i) {
+		if(i > 0) site = sites[parents[i]]->neighborsByDirection[directionIds[i]];
+		if(site == 0 || site->occupied) {  // no link in that direction or site already occupied -> take back the junctions placed so far;
+			for(size_t j=0; j<i; ++j) {
+				sites[j]->occupied = 0;
+				sites[j]->occupiedSymbol = '0';
+			}
+			return false;
+		}
+		site->occupied = 1;
+		site->occupiedSymbol = piece->symbol;
+		sites[i] = site;
+	}
+	return true;
+}
+
+void Configuration::remove() {
+
+	for(size_t i=0; i<sites.size(); ++i) {
+		sites[i]->occupied = 0;
+		sites[i]->occupiedSymbol = '0';
+	}
+}
+
+size_t Configuration::numberOfJunctions() {
+
+	return parents.size();
+}
+
+string branchesToString(Configuration* config, size_t junction) {  // same format as the links of a configuration in the code generators;
+
+	vector<size_t> branches;
+	for(size_t i=junction+1; i<config->parents.size(); ++i) {
+		if(config->parents[i] == (int) junction) branches.push_back(i);
+	}
+
+	ostringstream os;
+	for(size_t i=0; i<branches.size(); ++i) {
+		int id = config->directionIds[branches[i]];
+		string direction = Vector3d(id/9 - 1, id/3 % 3 - 1, id % 3 - 1).toString();
+		string rest = branchesToString(config, branches[i]);
+		if(branches.size() > 1) {
+			os << (i == 0 ? "[" : ", ") << "[ " << direction << (rest.empty() ? " " : ", ") << rest << "]";
+			if(i == branches.size()-1) os << "]";
+		} else {
+			os << direction << (rest.empty() ? " " : ", ") << rest;
+		}
+	}
+	return os.str();
+}
 
 string Configuration::toString() {
 
 	ostringstream os;
 	os << "[ ";
-	os << seed->toString();
+	os << branchesToString(this, 0);
 	os << " ]";
 
 	return os.str();
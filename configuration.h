@@ -24,16 +24,22 @@
 #include <string>
 #include <vector>
 
-class Junction;
+class LatticeSite;
+class Piece;
 
 using namespace std;
 
 class Configuration {
 public:
-	Junction* seed;  // the first junction of the piece;
+	vector<int> parents;  // index of the preceding junction of each junction (-1 for the seed); every junction follows its preceding junction, the seed comes first;
+	vector<int> directionIds;  // id of the direction from the preceding junction to each junction (see LatticeSite::neighborsByDirection; -1 for the seed);
+	vector<LatticeSite*> sites;  // the sites the junctions are located on while the configuration is placed;
 
-	Configuration();
+	Configuration(const int* data, size_t numberOfJunctions);  // data holds the pair (parent, direction id) of each junction;
 
+	bool place(LatticeSite* seed, Piece* piece);
+	void remove();
+	size_t numberOfJunctions();
 	string toString();
 };
 
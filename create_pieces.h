@@ -22,9 +22,7 @@
 #define INC_3D_PUZZLE_SOLVER_CREATE_PIECES_H
 
 #include "configuration.h"
-#include "junction.h"
 #include "piece.h"
-#include "vector3d.h"
 
 vector<Piece*>* createPieces() {
 
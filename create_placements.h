@@ -18,23 +18,15 @@
  *
  ***************************************************************************************/
 
-#ifndef INC_3D_PUZZLE_SOLVER_JUNCTION_H
-#define INC_3D_PUZZLE_SOLVER_JUNCTION_H
+#ifndef INC_3D_PUZZLE_SOLVER_CREATE_PLACEMENTS_H
+#define INC_3D_PUZZLE_SOLVER_CREATE_PLACEMENTS_H
 
-#include <string>
-#include <vector>
-#include <sstream>
+#include "candidatecounts.h"
 
-class Vector3d;
+CandidateCounts* createCandidateCounts() {
 
-using namespace std;
+    // fill generated code in here
+    return 0; // no placements generated: --mrv is not available
+}
 
-class Junction {
-public:
-    vector<Junction*> branches;    // branches going off the junction (branches.size() == number of junctions branching off this one);
-    vector<Vector3d*> directions;  // direction the branches are going to in the same order as above;
-
-    string toString();
-};
-
-#endif // INC_3D_PUZZLE_SOLVER_JUNCTION_H
\ No newline at end of file
+#endif // INC_3D_PUZZLE_SOLVER_CREATE_PLACEMENTS_H
\ No newline at end of file
@@ -19,15 +19,18 @@
  ***************************************************************************************/
 
 #include "lattice.h"
+#include "configuration.h"
 #include "latticesite.h"
 #include "layer.h"
+#include "piece.h"
+#include "row.h"
 #include <iostream>
 #include <sstream>
 
 using namespace std;
 
 Lattice::Lattice()
-		: numberOfSolutions(0)
+		: numberOfSolutions(0), numberOfNodes(0), maxNodes((size_t) -1), regionMarker(0)
 {}
 
 LatticeSite* Lattice::nextFreeSite() {
@@ -41,6 +44,66 @@ LatticeSite* Lattice::nextFreeSite() {
 	return 0;
 }
 
+bool Lattice::hasDeadRegion(Configuration* placed, vector<Piece*>* pieces) {
+
+	// fillable[n] indicates whether n sites can be filled with the unused pieces (subset sums of their sizes); it ends after the
+	// largest size that can't be filled, larger regions can always be filled as far as their size goes;
+	unsigned long long used = 0;
+	for(size_t k=0; k<pieces->size(); ++k) {
+		if((*pieces)[k]->used) used |= 1ULL << k;
+	}
+	vector<bool>& fillable = fillableSizes[used];
+	if(fillable.empty()) {
+		fillable.resize(1, true);
+		for(size_t k=0; k<pieces->size(); ++k) {
+			if(used >> k & 1) continue;
+			size_t size = (*pieces)[k]->numberOfJunctions();
+			fillable.resize(fillable.size() + size, false);
+			for(size_t n=fillable.size()-size; n-- > 0; ) {
+				if(fillable[n]) fillable[n+size] = true;
+			}
+		}
+		while(fillable.size() > 1 && fillable.back()) fillable.pop_back();
+	}
+	size_t limit = fillable.size();  // every region with at least `limit` sites is fillable;
+	if(limit == 1) return false;
+
+	// only regions next to the placed configuration can have been cut off by it; each of them is flood-filled until it turns out
+	// to be at least as large as the limit;
+	size_t firstMarker = regionMarker + 1;  // sites with a marker from firstMarker on have been reached during this call;
+	for(size_t i=0; i<placed->sites.size(); ++i) {
+		for(size_t j=0; j<placed->sites[i]->neighbors.size(); ++j) {
+			LatticeSite* site = placed->sites[i]->neighbors[j];
+			if(site->occupied != 0 || site->regionMarker >= firstMarker) continue;  // region has been visited already;
+
+			regionMarker += 1;
+			size_t regionSize = 0;
+			bool large = false;  // region reaches the limit (or is the same as one that is);
+			site->regionMarker = regionMarker;
+			regionStack.push_back(site);
+			while(!regionStack.empty() && !large) {
+				LatticeSite* current = regionStack.back();
+				regionStack.pop_back();
+				regionSize += 1;
+				large = regionSize >= limit;
+				for(size_t l=0; l<current->neighbors.size() && !large; ++l) {
+					LatticeSite* neighbor = current->neighbors[l];
+					if(neighbor->occupied != 0 || neighbor->regionMarker == regionMarker) continue;
+					large = neighbor->regionMarker >= firstMarker;  // reached by an earlier flood fill which reached the limit;
+					neighbor->regionMarker = regionMarker;
+					regionStack.push_back(neighbor);
+				}
+			}
+			if(large) {
+				regionStack.clear();
+				continue;
+			}
+			if(!fillable[regionSize]) return true;  // region can't be filled;
+		}
+	}
+	return false;
+}
+
 string Lattice::toString() {
 
 	ostringstream os;
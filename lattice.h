@@ -21,22 +21,31 @@
 #ifndef INC_3D_PUZZLE_SOLVER_LATTICE_H
 #define INC_3D_PUZZLE_SOLVER_LATTICE_H
 
+#include <map>
 #include <string>
 #include <vector>
 
+class Configuration;
 class LatticeSite;
 class Layer;
+class Piece;
 
 using namespace std;
 
 class Lattice {
 public:
 	size_t numberOfSolutions;
+	size_t numberOfNodes;  // number of placements made by the search;
+	size_t maxNodes;  // the search stops once it made this many placements;
 	vector<Layer*> layers;  // respective z-direction;
+	size_t regionMarker;  // incremented for every region that Lattice::hasDeadRegion flood-fills;
+	vector<LatticeSite*> regionStack;  // sites of the current region that still need to be visited;
+	map<unsigned long long, vector<bool> > fillableSizes;  // per set of used pieces (one bit per piece): which region sizes can be filled, see hasDeadRegion;
 
 	Lattice();
 
 	LatticeSite* nextFreeSite();
+	bool hasDeadRegion(Configuration* placed, vector<Piece*>* pieces);
 	string toString();
 	string toStringLightweight();
 };
@@ -21,14 +21,11 @@
 #ifndef INC_3D_PUZZLE_SOLVER_LATTICE_SITE_H
 #define INC_3D_PUZZLE_SOLVER_LATTICE_SITE_H
 
+#include "vector3d.h"
 #include <string>
 #include <vector>
 
-class Configuration;
-class Junction;
-class Piece;
 class Row;
-class Vector3d;
 
 using namespace std;
 
@@ -37,17 +34,16 @@ public:
 	size_t x;
 	size_t y;
 	size_t z;
-	int occupied;  // indicates whether this site is already occupied (0: not occupied, 1: occupied, 2: overlap);
+	int occupied;  // indicates whether this site is already occupied (0: not occupied, 1: occupied; see Configuration::place);
 	char occupiedSymbol;  // the symbol of the piece that currently occupies this site ('0' if not occupied);
 	Row* row;  // the row this site belongs to;
 	vector<Vector3d*> links;  // directions to the nearest neighbor sites;
 	vector<LatticeSite*> neighbors;  // the nearest neighbor sites; those are the ones that can be reached by a piece via a 1-link-connection; in the same order as the links above;
+	LatticeSite* neighborsByDirection[NUMBER_OF_DIRECTIONS];  // the same neighbors indexed by direction id (NULL if there is no link in that direction);
+	size_t regionMarker;  // set by Lattice::hasDeadRegion when the site has been assigned to a region;
 
 	LatticeSite(size_t x, size_t y, size_t z);
 
-	bool placePiece(Junction* junction, Piece* piece);
-	void removePiece(Junction* junction);
-	bool hasLinks(Junction* junction, vector<LatticeSite*>& relevant_neighbors);
 	string toString();
 	string asSymbol();
 };
@@ -25,13 +25,23 @@
 #include "configuration.h"
 #include "create_lattice.h"
 #include "create_pieces.h"
+#include "create_placements.h"
+#include "candidatecounts.h"
+#include "checkpoint.h"
+#include "layer.h"
+#include "row.h"
 #include <iostream>
+#include <fstream>
 #include <ctime>
+#include <cstdlib>
+#include <string>
+#include <unistd.h>
 
 using namespace std;
 
-void start(Lattice* lattice, vector<Piece*>* pieces);
-void iter(Lattice* lattice, vector<Piece*>* pieces);
+void start(Lattice* lattice, vector<Piece*>* pieces, Checkpoint* checkpoint, bool prune, CandidateCounts* counts, ostream* output);
+void iter(Lattice* lattice, vector<Piece*>* pieces, Checkpoint* checkpoint, bool prune, ostream* output);
+void iterMostConstrained(Lattice* lattice, vector<Piece*>* pieces, CandidateCounts* counts, vector<LatticeSite*>& sites, bool prune, ostream* output);
 
 int main(int argc, char** argv)
 {
@@ -39,17 +49,120 @@ int main(int argc, char** argv)
 	Lattice* lattice = createLattice();
 	vector<Piece*>* pieces = createPieces();
 
-	start(lattice, pieces);
+	// usage: solver [--output FILE [--checkpoint FILE [--interval SECONDS]]] [--prune] [--mrv] [--max-steps N]
+	string outputPath;
+	string checkpointPath;
+	double interval = 60;
+	bool prune = false;
+	bool mostConstrained = false;
+	for(int i=1; i<argc; ++i) {
+		string arg = argv[i];
+		if(arg == "--output" && i+1 < argc) {
+			outputPath = argv[++i];
+		} else if(arg == "--checkpoint" && i+1 < argc) {
+			checkpointPath = argv[++i];
+		} else if(arg == "--interval" && i+1 < argc) {
+			interval = atof(argv[++i]);
+		} else if(arg == "--prune") {
+			prune = true;
+		} else if(arg == "--mrv") {
+			mostConstrained = true;
+		} else if(arg == "--max-steps" && i+1 < argc) {  // stop after N placements (for comparing the solvers' speed);
+			lattice->maxNodes = strtoul(argv[++i], 0, 10);
+		} else {
+			cerr << "usage: " << argv[0] << " [--output FILE [--checkpoint FILE [--interval SECONDS]]] [--prune] [--mrv] [--max-steps N]" << endl;
+			return 1;
+		}
+	}
+
+	if(prune && pieces->size() > 64) {
+		cerr << "--prune supports at most 64 pieces" << endl;  // see Lattice::fillableSizes;
+		return 1;
+	}
+
+	CandidateCounts* counts = 0;
+	if(mostConstrained) {
+		if(!checkpointPath.empty()) {
+			cerr << "--checkpoint can't be combined with --mrv" << endl;
+			return 1;
+		}
+		counts = createCandidateCounts();
+		if(counts == 0) {
+			cerr << "--mrv requires the placements in create_placements.h (see code-generators)" << endl;
+			return 1;
+		}
+	}
+
+	Checkpoint* checkpoint = 0;
+	if(!checkpointPath.empty()) {
+		if(lattice->maxNodes != (size_t) -1) {
+			cerr << "--checkpoint can't be combined with --max-steps" << endl;
+			return 1;
+		}
+		if(outputPath.empty()) {
+			cerr << "--checkpoint requires --output (the output is cut back to the checkpoint when resuming)" << endl;
+			return 1;
+		}
+		checkpoint = new Checkpoint(checkpointPath, interval);
+		size_t outputSize;  // size of the output when the checkpoint was written;
+		if(checkpoint->load(&lattice->numberOfSolutions, &outputSize)) {
+			ifstream previous(outputPath.c_str(), ios::binary | ios::ate);
+			if(!previous || (size_t) previous.tellg() < outputSize) {
+				cerr << outputPath << " doesn't hold the solutions up to the checkpoint" << endl;
+				return 1;
+			}
+			previous.close();
+			if(truncate(outputPath.c_str(), outputSize) != 0) {  // drop the solutions found after the checkpoint, they are found again;
+				cerr << "can't truncate " << outputPath << endl;
+				return 1;
+			}
+			cerr << "resuming after " << lattice->numberOfSolutions << " solutions" << endl;
+		}
+	}
+
+	ostream* output = &cout;
+	ofstream outputFile;
+	if(!outputPath.empty()) {
+		if(checkpoint != 0 && checkpoint->resuming) {  // append to the solutions up to the checkpoint;
+			outputFile.open(outputPath.c_str(), ios::in | ios::out | ios::binary);
+			outputFile.seekp(0, ios::end);
+		} else {
+			outputFile.open(outputPath.c_str(), ios::out | ios::binary);
+		}
+		if(!outputFile) {
+			cerr << "can't open " << outputPath << endl;
+			return 1;
+		}
+		output = &outputFile;
+	}
+
+	start(lattice, pieces, checkpoint, prune, counts, output);
 
 	return 0;
 }
 
-void start(Lattice* lattice, vector<Piece*>* pieces) {
+void start(Lattice* lattice, vector<Piece*>* pieces, Checkpoint* checkpoint, bool prune, CandidateCounts* counts, ostream* output) {
+
+	vector<LatticeSite*> sites;  // all sites in the order of the placement data;
+	for(size_t i=0; i<lattice->layers.size(); ++i) {
+		for(size_t j=0; j<lattice->layers[i]->rows.size(); ++j) {
+			for(size_t k=0; k<lattice->layers[i]->rows[j]->sites.size(); ++k) {
+				sites.push_back(lattice->layers[i]->rows[j]->sites[k]);
+			}
+		}
+	}
 
 	time_t startTime;
 	time(&startTime);
 	
-	iter(lattice, pieces);
+	if(counts != 0) {  // fill the free site with the fewest fitting placements next;
+		iterMostConstrained(lattice, pieces, counts, sites, prune, output);
+	} else {
+		iter(lattice, pieces, checkpoint, prune, output);
+	}
+	output->flush();
+
+	if(checkpoint != 0) checkpoint->remove();  // enumeration is complete;
 
 	time_t stopTime;
 	time(&stopTime);
@@ -59,35 +172,100 @@ void start(Lattice* lattice, vector<Piece*>* pieces) {
 	cerr << "computing time: " << seconds << " seconds" << endl;
 
 	cerr << "number of solutions found: " << lattice->numberOfSolutions << endl;
+
+	cerr << "number of nodes visited: " << lattice->numberOfNodes << endl;
 }
 
-void iter(Lattice* lattice, vector<Piece*>* pieces) {
+void iter(Lattice* lattice, vector<Piece*>* pieces, Checkpoint* checkpoint, bool prune, ostream* output) {
+
+	size_t firstPiece = 0;
+	size_t firstMarker = 0;  // resuming: the config marker of the first piece;
+	if(checkpoint != 0) {
+		size_t depth = checkpoint->pieceIndices.size();
+		if(checkpoint->resuming) {
+			if(depth < checkpoint->resumeIndices.size()) {  // redo the placement that was made at this depth;
+				firstPiece = checkpoint->resumeIndices[depth];
+				firstMarker = checkpoint->resumeMarkers[depth];
+			} else {  // resumed position reached;
+				checkpoint->resuming = false;
+			}
+		} else if(checkpoint->due()) {  // all solutions before this state have been found and written;
+			output->flush();
+			checkpoint->write(lattice->numberOfSolutions, (size_t) output->tellp());
+		}
+	}
 
 	LatticeSite* site = lattice->nextFreeSite();
 	if(site == 0) {  // lattice is complete;
 		lattice->numberOfSolutions += 1;
-		cout << lattice->toStringLightweight() << endl;
+		*output << lattice->toStringLightweight() << endl;
 		return;
 	}
 	
-	for(vector<Piece*>::iterator it_p=pieces->begin(); it_p!=pieces->end(); ++it_p) {
-		Piece* piece = *it_p;
+	for(size_t i=firstPiece; i<pieces->size(); ++i) {
+		Piece* piece = (*pieces)[i];
 		if(piece->used) continue;
 		piece->resetConfigMarker();
+		if(i == firstPiece && firstMarker > 0) piece->currentConfigMarker = firstMarker - 1;
 		Configuration* config = piece->nextConfig();
 		do {
-			bool success = site->placePiece(config->seed, piece);
+			if(lattice->numberOfNodes == lattice->maxNodes) return;
+			bool success = config->place(site, piece);
 			if(success) {
 				piece->used = true;
 				piece->site = site;
+				lattice->numberOfNodes += 1;
+
+				// skip the subtree if the placement cut off free sites that can't be filled;
+				bool dead = prune && (checkpoint == 0 || !checkpoint->resuming) && lattice->hasDeadRegion(config, pieces);
+				if(!dead) {
+					if(checkpoint != 0) checkpoint->push(i, piece);
+					iter(lattice, pieces, checkpoint, prune, output);
+					if(checkpoint != 0) checkpoint->pop();
+				}
 
-				iter(lattice, pieces);
+				config->remove();
+				piece->used = false;
+				piece->site = 0;
 			}
-			site->removePiece(config->seed);
-			piece->used = false;
-			piece->site = 0;
 
 			config = piece->nextConfig();
 		} while(config != 0);
 	}
+}
+
+void iterMostConstrained(Lattice* lattice, vector<Piece*>* pieces, CandidateCounts* counts, vector<LatticeSite*>& sites, bool prune, ostream* output) {
+
+	int siteIndex = counts->argmin();
+	if(siteIndex == -1) {  // lattice is complete;
+		lattice->numberOfSolutions += 1;
+		*output << lattice->toStringLightweight() << endl;
+		return;
+	}
+
+	vector<size_t> placements;  // all placements that fit and cover the chosen site;
+	counts->fitting(siteIndex, placements);
+	for(size_t i=0; i<placements.size(); ++i) {
+		if(lattice->numberOfNodes == lattice->maxNodes) return;
+		size_t placement = placements[i];
+		Piece* piece = (*pieces)[counts->placementPieces[placement]];
+		LatticeSite* site = sites[counts->placementAnchors[placement]];
+		Configuration* config = piece->configs[counts->placementConfigs[placement]];
+		bool success = config->place(site, piece);
+		if(success) {
+			piece->used = true;
+			piece->site = site;
+			lattice->numberOfNodes += 1;
+
+			if(!prune || !lattice->hasDeadRegion(config, pieces)) {  // otherwise the placement cut off free sites that can't be filled;
+				counts->place(placement);
+				iterMostConstrained(lattice, pieces, counts, sites, prune, output);
+				counts->remove(placement);
+			}
+
+			config->remove();
+			piece->used = false;
+			piece->site = 0;
+		}
+	}
 }
\ No newline at end of file
@@ -25,7 +25,7 @@
 using namespace std;
 
 Piece::Piece(char symbol)
-		: symbol(symbol), used(false), currentConfigMarker(currentConfigMarker)
+		: symbol(symbol), used(false), currentConfigMarker(currentConfigMarker), size(0)
 {}
 
 Configuration* Piece::nextConfig() {
@@ -41,6 +41,11 @@ void Piece::resetConfigMarker() {
 	currentConfigMarker = 0;
 }
 
+size_t Piece::numberOfJunctions() {
+	if(size == 0) size = configs[0]->numberOfJunctions();
+	return size;
+}
+
 string Piece::toString() {
 	if(currentConfigMarker <= configs.size()) {
 		return configs[currentConfigMarker-1]->toString();
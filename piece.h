@@ -36,11 +36,13 @@ public:
 	size_t currentConfigMarker;  // indicates the configuration that will be returned next by Piece::nextConfig();
 	vector<Configuration*> configs;  // all configurations of that piece;
 	LatticeSite* site;  // the lattice site on which the current config's seed was placed;
+	size_t size;  // number of junctions of each configuration (0: not counted yet);
 
 	Piece(char symbol);
 
 	Configuration* nextConfig();
 	void resetConfigMarker();
+	size_t numberOfJunctions();
 	string toString();
 };
 
@@ -26,6 +26,8 @@
 
 using namespace std;
 
+const size_t NUMBER_OF_DIRECTIONS = 27;  // direction (dx,dy,dz) with components in {-1,0,1} has the id (dx+1)*9 + (dy+1)*3 + (dz+1) (see puzzle3d.directions.direction_id);
+
 class Vector3d {
 public:
 	int dx;